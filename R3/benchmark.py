@@ -0,0 +1,162 @@
+import argparse
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+import generate_map
+from geometry import circle_points, to_point_dicts
+from map_io import get_backend, load_json, write_json
+
+# 合成对象的类型与名称前缀
+OBJECT_TYPES = {1: "MZ", 3: "NG", 4: "TP", 5: "CS", 6: "PS"}
+
+
+def _object_template(name, object_type):
+    return {
+        "area": {"points": None},
+        "header": {
+            "arp": {"x": -232840418, "y": 538828236, "z": 248676389},
+            "confirmed": True,
+            "name": name,
+            "original_source": {"mower_serial_number": 250660605, "type": "mower"},
+            "ra_serial_number": 250351271,
+            "type": {"type": object_type},
+            "verified": False,
+        },
+        "transport_path": {"points": None, "width": 2.0},
+        "waypoint": {
+            "device_type": {"group": 0, "sub_group": 0, "variant": 0},
+            "entry_direction": 0.0,
+            "location": {"x": 0.0, "y": 0.0},
+            "serial_number": 0,
+        },
+    }
+
+
+def generate_site(folder, n_objects, n_points, map_name="map001"):
+    """
+    生成合成场地：definition.json、一个 .map，以及每种类型各 n_objects 个 .object。
+
+    :param n_points: 区域和运输路径的点数
+    :return: 对象名列表
+    """
+    os.makedirs(folder, exist_ok=True)
+    names = []
+    for object_type, prefix in OBJECT_TYPES.items():
+        for i in range(n_objects):
+            name = f"{prefix}{i + 1:03d}"
+            data = _object_template(name, object_type)
+            center_x, center_y = (i % 100) * 50.0, (i // 100) * 50.0
+            if object_type in (1, 3):
+                data["area"]["points"] = to_point_dicts(circle_points(center_x, center_y, 300.0, n_points))
+            elif object_type == 4:
+                points = circle_points(center_x, center_y, 300.0, n_points + 1)[:n_points]
+                data["transport_path"]["points"] = to_point_dicts(points)
+            else:
+                data["waypoint"]["location"] = {"x": center_x, "y": center_y}
+            write_json(os.path.join(folder, f"{name}.object"), data)
+            names.append(name)
+
+    now = int(time.time())
+    write_json(os.path.join(folder, f"{map_name}.map"), {
+        "attributes": [],
+        "common_attributes": {"interval_time": 65535},
+        "confirmed": True,
+        "last_modification": now,
+        "name": map_name,
+        "objects": [{"cut": True, "enabled": True, "name": name} for name in names],
+    })
+    write_json(os.path.join(folder, "definition.json"), {
+        "full_control_pin": 65535, "name": "benchmarkSite", "name_extension": now,
+        "read_only_pin": 65535, "time_stamp": now, "version": 1,
+    })
+    return names
+
+
+def measure(func, args=(), kwargs=None, reset=None):
+    """
+    返回墙钟时间（秒）和峰值内存（字节）。
+
+    tracemalloc 本身会显著拖慢执行，所以计时和内存统计分两次运行，每次运行前调用 reset 恢复初始状态。
+    """
+    kwargs = kwargs or {}
+    if reset:
+        reset()
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    if reset:
+        reset()
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": elapsed, "peak_bytes": peak}
+
+
+def _reset_folder(folder):
+    shutil.rmtree(folder, ignore_errors=True)
+    os.makedirs(folder)
+
+
+def _cases(site, output, n_points):
+    template = os.path.join(site, "MZ001.object")
+    data = load_json(template)
+    new_points = generate_map.generate_point_list(0, 0, 300.0, n_points)
+    return [
+        ("generate_point_list", generate_map.generate_point_list, (0, 0, 300.0, n_points), {}),
+        ("modify_json", generate_map.modify_json, (data, "$.area.points", new_points), {}),
+        ("offset_points_in_template", generate_map.offset_points_in_template,
+         (site, output, "MZ001", "MZ001x10y10", 10, 10), {}),
+        ("replace_points_in_template", generate_map.replace_points_in_template,
+         (site, output, "MZ001", "MZ001new", new_points), {}),
+        ("copy_zones", generate_map.copy_zones, (site, output, "map001", 10, 10), {"max_workers": 1}),
+    ]
+
+
+def run_benchmarks(sizes, output_path, work_dir=None):
+    """
+    按不同规模运行基准测试并把结果写入JSON文件，便于不同版本之间对比。
+
+    :param sizes: [(n_objects, n_points), ...]
+    """
+    results = []
+    root = tempfile.mkdtemp(prefix="r3_benchmark_", dir=work_dir)
+    try:
+        for n_objects, n_points in sizes:
+            site = os.path.join(root, f"site_{n_objects}_{n_points}")
+            output = os.path.join(root, f"output_{n_objects}_{n_points}")
+            generate_site(site, n_objects, n_points)
+            for name, func, args, kwargs in _cases(site, output, n_points):
+                # 每次运行都从空的输出文件夹开始（copy_zones 会追加到已存在的输出地图）
+                timing = measure(func, args, kwargs, reset=lambda: _reset_folder(output))
+                results.append({"case": name, "n_objects": n_objects, "n_points": n_points, **timing})
+                print(f"{name:<28} objects={n_objects:<6} points={n_points:<7} "
+                      f"{timing['seconds'] * 1000:10.2f} ms {timing['peak_bytes'] / 1024 / 1024:8.2f} MiB")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "json_backend": get_backend(),
+        "results": results,
+    }
+    write_json(output_path, report)
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="R3 地图生成/编辑基准测试")
+    parser.add_argument("--objects", type=int, nargs="+", default=[10, 100], help="每种类型的对象数")
+    parser.add_argument("--points", type=int, nargs="+", default=[100, 1000], help="每个区域/路径的点数")
+    parser.add_argument("--output", default="benchmark_result.json", help="结果JSON文件")
+    args = parser.parse_args()
+    run_benchmarks([(n_objects, n_points) for n_objects in args.objects for n_points in args.points], args.output)
@@ -1,160 +1,197 @@
-import json
-import math
 import os
-import copy
 import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pprint import pprint
 from pathlib import Path
-from jsonpath_ng import parse, Fields, Index
+from geometry import circle_points, from_point_dicts, polygon_area, simplify_points, to_point_dicts
+from json_path import get_path, set_path, set_paths
+from map_folder import MapFolder, file_exists, list_files, read_file, write_file
+from map_io import dumps
+from transform import transform_object, translation
 
 
 def generate_point_list(center_x, center_y, target_area, n_points):
-    target_radius = math.sqrt(target_area / math.pi)
-    circle_points = []
-
-    # 生成角度序列（0到2π）
-    angle_step = 2 * math.pi / n_points
-    for i in range(n_points):
-        angle = i * angle_step
-        x = center_x + target_radius * math.cos(angle)
-        y = center_y + target_radius * math.sin(angle)
-        circle_points.append({"x": x, "y": y})
-
-    return circle_points
+    # 按面积修正半径后生成圆形，序列化时才转换为字典列表
+    return to_point_dicts(circle_points(center_x, center_y, target_area, n_points))
 
 
 def modify_json(json_data, json_path, value):
-    try:
-        jsonpath_expr = parse(json_path)
-    except Exception as e:
-        raise ValueError(f"无效的JSON Path表达式: {json_path}") from e
-
-    # 创建深拷贝以避免修改原始数据
-    modified_data = copy.deepcopy(json_data)
-
-    matches = jsonpath_expr.find(modified_data)
-    if not matches:
-        raise ValueError(f"在JSON中未找到路径: {json_path}")
-
-    # 处理第一个匹配项
-    match = matches[0]
-
-    # 获取父对象
-    parent = match.context.value
-
-    # 根据路径类型处理不同的访问方式
-    if isinstance(match.path, Fields):
-        # 对象字段访问
-        field_name = match.path.fields[0]  # 取第一个字段名
-        parent[field_name] = value
-    elif hasattr(match.path, 'right'):
-        # 复合路径（如数组索引或嵌套对象）
-        last_accessor = match.path.right
-
-        if isinstance(last_accessor, Index):
-            # 数组索引访问
-            parent[last_accessor.index] = value
-        elif hasattr(last_accessor, 'value'):
-            # 对象键访问
-            parent[last_accessor.value] = value
-        else:
-            # 其他类型的访问器
-            raise TypeError(f"不支持的访问器类型: {type(last_accessor).__name__}")
-    elif match.context is None:
-        # 匹配的是根节点
-        return value
-    else:
-        # 其他类型的路径
-        raise TypeError(f"不支持的路径类型: {type(match.path).__name__}")
-
-    return modified_data
+    # 兼容旧接口：写时复制，只复制被修改路径上的节点，不再深拷贝整个文档
+    return set_path(json_data, json_path, value, copy=True)
 
 
 def replace_points_in_template(input_folder, output_folder, old_name, new_name, new_points):
-    with open(os.path.join(input_folder, f"{old_name}.object"), 'r') as file:
-        data = json.load(file)
+    data = read_file(input_folder, f"{old_name}.object")
 
-    data = modify_json(data, "$.area.points", new_points)
-    data = modify_json(data, "$.header.name", new_name)
+    # 写时复制，避免修改 MapFolder 中缓存的模板
+    data = set_paths(data, {"$.area.points": new_points, "$.header.name": new_name}, copy=True)
 
-    with open(os.path.join(output_folder, f"{new_name}.object"), 'w', newline='\n') as file:
-        json.dump(data, file, indent=None, separators=(",", ":"))
+    write_file(output_folder, f"{new_name}.object", data)
 
     return data
 
 
+def offset_object(data, offset_x=0, offset_y=0, new_name=None):
+    # 返回平移后的新文档（写时复制），不修改模板数据，便于同一模板生成多个副本
+    return transform_object(data, translation(offset_x, offset_y), new_name)
+
+
 def offset_points_in_template(input_folder, output_folder, old_name, new_name, offset_x=0, offset_y=0):
-    with open(os.path.join(input_folder, f"{old_name}.object"), 'r') as file:
-        data = json.load(file)
-
-    object_type = parse("$.header.type.type").find(data)[0].value
-    if object_type in [1, 3]:
-        new_points = data['area']['points']
-        print(new_points)
-        for point in new_points:
-            point['x'] = point['x'] + offset_x
-            point['y'] = point['y'] + offset_y
-        print(new_points)
-        data = modify_json(data, "$.area.points", new_points)
-
-    elif object_type == 4:
-        new_points = data['transport_path']['points']
-        print(new_points)
-        for point in new_points:
-            point['x'] = point['x'] + offset_x
-            point['y'] = point['y'] + offset_y
-        print(new_points)
-        data = modify_json(data, "$.area.points", new_points)
-
-    elif object_type in [5, 6]:
-        point = data['waypoint']['location']
-        print(point)
-        point['x'] = point['x'] + offset_x
-        point['y'] = point['y'] + offset_y
-        print(point)
-        data = modify_json(data, "$.waypoint.location", point)
-
-    data = modify_json(data, "$.header.name", new_name)
-
-    with open(os.path.join(output_folder, f"{new_name}.object"), 'w', newline='\n') as file:
-        json.dump(data, file, indent=None, separators=(",", ":"))
+    data = read_file(input_folder, f"{old_name}.object")
+
+    data = offset_object(data, offset_x, offset_y, new_name)
+
+    write_file(output_folder, f"{new_name}.object", data)
 
     return data
 
 
-def copy_zones(input_folder, output_folder, map_name, offset_x, offset_y):
-    with open(os.path.join(input_folder, f"{map_name}.map"), 'r') as file:
-        map_data = json.load(file)
+def offset_zone_name(old_zone_name, offset_x, offset_y):
+    x = f"D{abs(offset_x)}" if offset_x < 0 else f"{offset_x}"
+    y = f"D{abs(offset_y)}" if offset_y < 0 else f"{offset_y}"
+    return f"{old_zone_name}x{x}y{y}"
+
+
+def make_offset_grid(n_x, n_y, step_x, step_y, origin_x=0, origin_y=0, skip_origin=True):
+    """
+    生成 n_x × n_y 的偏移网格，按行（先x后y）排列。
+
+    :param skip_origin: 跳过(0, 0)偏移，模板本身已在地图中
+    """
+    offsets = []
+    for j in range(n_y):
+        for i in range(n_x):
+            offset = (origin_x + i * step_x, origin_y + j * step_y)
+            if skip_origin and offset == (0, 0):
+                continue
+            offsets.append(offset)
+    return offsets
+
+
+def _replicate_object(input_folder, output_folder, old_zone_name, offsets):
+    # 单个模板对象：读取一次，写出全部平移副本
+    template = read_file(input_folder, f"{old_zone_name}.object")
+    new_zone_names = []
+    for offset_x, offset_y in offsets:
+        new_zone_name = offset_zone_name(old_zone_name, offset_x, offset_y)
+        write_file(output_folder, f"{new_zone_name}.object", offset_object(template, offset_x, offset_y, new_zone_name))
+        new_zone_names.append(new_zone_name)
+    return new_zone_names
+
+
+def replicate_zones(input_folder, output_folder, map_name, offsets, max_workers=None):
+    """
+    按偏移列表一次性复制地图中的所有对象。
+
+    每个模板对象只读取一次，.map 和 definition.json 只写入一次。对象的读取、平移、写入在进程池中并行执行。
+
+    :param offsets: [(offset_x, offset_y), ...]，可由 make_offset_grid 生成
+    :param input_folder: 文件夹路径或 MapFolder
+    :param output_folder: 文件夹路径或 MapFolder（写入 MapFolder 时需调用其 save()）
+    :param max_workers: 进程数，默认为CPU核数，1表示在当前进程中顺序执行
+    :return: 新增对象名列表
+    """
+    map_data = read_file(input_folder, f"{map_name}.map")
     zones = map_data['objects']
-    new_zones = []
-    for zone in zones:
-        old_zone_name = zone['name']
-        x = f"D{abs(offset_x)}" if offset_x < 0 else f"{offset_x}"
-        y = f"D{abs(offset_y)}" if offset_y < 0 else f"{offset_y}"
-        new_zone_name = f"{old_zone_name}x{x}y{y}"
-        print(f"Copying {old_zone_name} to {new_zone_name}")
-        offset_points_in_template(input_folder, output_folder, old_zone_name, new_zone_name, offset_x, offset_y)
-        new_zones.append({'cut': True, 'enabled': True, 'name': new_zone_name})
-
-    if os.path.exists(os.path.join(output_folder, f"{map_name}.map")):
-        with open(os.path.join(output_folder, f"{map_name}.map"), 'r') as file:
-            map_data2 = json.load(file)
+    old_zone_names = [zone['name'] for zone in zones]
+    offsets = list(offsets)
+
+    max_workers = max_workers or os.cpu_count() or 1
+    # MapFolder 的缓存无法跨进程共享，在当前进程中执行
+    in_memory = isinstance(input_folder, MapFolder) or isinstance(output_folder, MapFolder)
+    if max_workers == 1 or len(old_zone_names) <= 1 or in_memory:
+        results = [_replicate_object(input_folder, output_folder, name, offsets) for name in old_zone_names]
+    else:
+        chunksize = max(1, len(old_zone_names) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_replicate_object, repeat(input_folder), repeat(output_folder),
+                                        old_zone_names, repeat(offsets), chunksize=chunksize))
+    print(f"Copied {len(old_zone_names)} objects to {len(offsets)} offsets in {output_folder}")
+
+    # 保持与逐个偏移调用 copy_zones 相同的顺序
+    new_zones = [{'cut': True, 'enabled': True, 'name': names[i]} for i in range(len(offsets)) for names in results]
+
+    if file_exists(output_folder, f"{map_name}.map"):
+        map_data2 = read_file(output_folder, f"{map_name}.map")
         zones2 = map_data2['objects']
         zones = zones2 + new_zones
     else:
         zones = zones + new_zones
 
-    map_data = modify_json(map_data, "$.objects", zones)
-    map_data = modify_json(map_data, "$.last_modification", int(time.time()))
-
-    with open(os.path.join(output_folder, f"{map_name}.map"), 'w', newline='\n') as file:
-            json.dump(map_data, file, indent=None, separators=(",", ":"))
-
-    with open(os.path.join(input_folder, "definition.json"), 'r') as file:
-        site_data = json.load(file)
-    site_data = modify_json(site_data, "$.time_stamp", int(time.time()))
-    with open(os.path.join(output_folder, "definition.json"), 'w', newline='\n') as file:
-        json.dump(site_data, file, indent=None, separators=(",", ":"))
+    map_data = set_paths(map_data, {"$.objects": zones, "$.last_modification": int(time.time())}, copy=True)
+    write_file(output_folder, f"{map_name}.map", map_data)
+
+    site_data = set_path(read_file(input_folder, "definition.json"), "$.time_stamp", int(time.time()), copy=True)
+    write_file(output_folder, "definition.json", site_data)
+
+    return [zone['name'] for zone in new_zones]
+
+
+def copy_zones(input_folder, output_folder, map_name, offset_x, offset_y, max_workers=None):
+    # 多个偏移请直接使用 replicate_zones，避免重复读写 .map 和 definition.json
+    replicate_zones(input_folder, output_folder, map_name, [(offset_x, offset_y)], max_workers)
+
+
+# 需要简化的对象类型：区域为闭合多边形，运输路径为折线
+SIMPLIFY_FIELDS = {1: ("$.area.points", True), 3: ("$.area.points", True), 4: ("$.transport_path.points", False)}
+
+
+def simplify_object(data, tolerance):
+    """
+    在允许偏差内简化对象的边界/路径点（Douglas–Peucker）。
+
+    :param tolerance: 允许的最大偏离距离（米）
+    :return: (新文档, 报告)，不适用的对象类型返回 (原文档, None)
+    """
+    object_type = get_path(data, "$.header.type.type")
+    if object_type not in SIMPLIFY_FIELDS:
+        return data, None
+    json_path, closed = SIMPLIFY_FIELDS[object_type]
+    point_list = get_path(data, json_path)
+    if not point_list:
+        return data, None
+
+    points = from_point_dicts(point_list)
+    simplified = simplify_points(points, tolerance, closed)
+    new_point_list = to_point_dicts(simplified)
+    report = {
+        "name": get_path(data, "$.header.name"),
+        "type": object_type,
+        "points_before": len(points),
+        "points_after": len(simplified),
+        "bytes_before": len(dumps(point_list)),
+        "bytes_after": len(dumps(new_point_list)),
+        "area_before": None,
+        "area_after": None,
+        "area_diff": None,
+    }
+    if closed:
+        report["area_before"] = abs(float(polygon_area(points)))
+        report["area_after"] = abs(float(polygon_area(simplified)))
+        report["area_diff"] = report["area_after"] - report["area_before"]
+    return set_path(data, json_path, new_point_list, copy=True), report
+
+
+def simplify_map_objects(input_folder, output_folder, tolerance, object_types=(1, 3, 4)):
+    """
+    简化文件夹中所有区域(1/3)和运输路径(4)对象，写入输出文件夹（可与输入相同）。
+
+    :return: 每个对象的报告列表（点数、字节数、面积变化）
+    """
+    reports = []
+    for filename in list_files(input_folder, ".object"):
+        data = read_file(input_folder, filename)
+        if get_path(data, "$.header.type.type") not in object_types:
+            continue
+        data, report = simplify_object(data, tolerance)
+        if report is None:
+            continue
+        write_file(output_folder, filename, data)
+        print(f"Simplified {report['name']}: {report['points_before']} -> {report['points_after']} points, "
+              f"{report['bytes_before']} -> {report['bytes_after']} bytes, area diff {report['area_diff']}")
+        reports.append(report)
+    return reports
 
 
 if __name__ == '__main__':
@@ -172,6 +209,9 @@ if __name__ == '__main__':
     n_points = 1000
     circle_points = generate_point_list(center_x, center_y, target_area, n_points)
 
+    # 简化边界点（允许偏差1厘米）
+    # simplify_map_objects(output_folder, output_folder, 0.01)
+
     # result = replace_points_in_template(input_folder, output_folder, old_name, new_name, circle_points)
 
     # result = offset_points_in_template(input_folder, output_folder, old_name, new_name, 0, -100)
@@ -179,3 +219,6 @@ if __name__ == '__main__':
     # pprint(result, indent=2, width=50)
 
     copy_zones(input_folder, output_folder, "map001", 200, 400)
+
+    # 一次性平铺 3×3 网格（间距200米）
+    # replicate_zones(input_folder, output_folder, "map001", make_offset_grid(3, 3, 200, 200))
@@ -0,0 +1,332 @@
+import numpy as np
+
+
+def _as_array(center_x, center_y, value):
+    return np.asarray(center_x, dtype=np.float64), np.asarray(center_y, dtype=np.float64), np.asarray(value, dtype=np.float64)
+
+
+def _unit_angles(n_points, rotation=0.0):
+    # 生成角度序列（0到2π），rotation为起始角度（弧度）
+    return rotation + np.arange(n_points, dtype=np.float64) * (2 * np.pi / n_points)
+
+
+def _polygon_radius(target_area, n_points):
+    # 正n边形面积 = n/2 * r^2 * sin(2π/n)，据此反推外接圆半径，使多边形面积正好等于target_area
+    return np.sqrt(2 * np.asarray(target_area, dtype=np.float64) / (n_points * np.sin(2 * np.pi / n_points)))
+
+
+def regular_polygon_points(center_x, center_y, target_area, n_points, rotation=0.0):
+    """
+    生成面积精确等于target_area的正多边形顶点（逆时针）。
+
+    center_x/center_y/target_area可以是标量，也可以是长度为m的数组（一次生成m个图形）。
+
+    :return: 标量输入返回(n_points, 2)数组，数组输入返回(m, n_points, 2)数组
+    """
+    if n_points < 3:
+        raise ValueError(f"至少需要3个点才能组成多边形: {n_points}")
+    cx, cy, area = _as_array(center_x, center_y, target_area)
+    radius = _polygon_radius(area, n_points)
+    angles = _unit_angles(n_points, rotation)
+    points = np.empty(np.broadcast(cx, cy, radius).shape + (n_points, 2), dtype=np.float64)
+    points[..., 0] = cx[..., None] + radius[..., None] * np.cos(angles)
+    points[..., 1] = cy[..., None] + radius[..., None] * np.sin(angles)
+    return points
+
+
+def circle_points(center_x, center_y, target_area, n_points):
+    # 圆形即点数足够多的正多边形，半径已按面积修正
+    return regular_polygon_points(center_x, center_y, target_area, n_points)
+
+
+def ellipse_points(center_x, center_y, target_area, n_points, aspect=1.0, rotation=0.0):
+    """
+    生成面积精确等于target_area的椭圆（内接多边形）顶点。
+
+    :param aspect: 长轴/短轴之比
+    :param rotation: 长轴相对x轴的旋转角度（弧度）
+    """
+    if n_points < 3:
+        raise ValueError(f"至少需要3个点才能组成多边形: {n_points}")
+    cx, cy, area = _as_array(center_x, center_y, target_area)
+    # 椭圆内接多边形是正多边形的仿射变换，面积 = n/2 * a * b * sin(2π/n)
+    ab = _polygon_radius(area, n_points) ** 2
+    a = np.sqrt(ab * aspect)
+    b = np.sqrt(ab / aspect)
+    angles = _unit_angles(n_points)
+    local_x = a[..., None] * np.cos(angles)
+    local_y = b[..., None] * np.sin(angles)
+    cos_r, sin_r = np.cos(rotation), np.sin(rotation)
+    points = np.empty(np.broadcast(cx, cy, a).shape + (n_points, 2), dtype=np.float64)
+    points[..., 0] = cx[..., None] + local_x * cos_r - local_y * sin_r
+    points[..., 1] = cy[..., None] + local_x * sin_r + local_y * cos_r
+    return points
+
+
+def rectangle_points(center_x, center_y, target_area, aspect=1.0, rotation=0.0):
+    """
+    生成面积为target_area的矩形四个顶点（逆时针）。
+
+    :param aspect: 宽/高之比
+    :param rotation: 旋转角度（弧度）
+    """
+    cx, cy, area = _as_array(center_x, center_y, target_area)
+    half_w = np.sqrt(area * aspect) / 2
+    half_h = np.sqrt(area / aspect) / 2
+    signs = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]], dtype=np.float64)
+    local_x = half_w[..., None] * signs[:, 0]
+    local_y = half_h[..., None] * signs[:, 1]
+    cos_r, sin_r = np.cos(rotation), np.sin(rotation)
+    points = np.empty(np.broadcast(cx, cy, half_w).shape + (4, 2), dtype=np.float64)
+    points[..., 0] = cx[..., None] + local_x * cos_r - local_y * sin_r
+    points[..., 1] = cy[..., None] + local_x * sin_r + local_y * cos_r
+    return points
+
+
+def polygon_area(points):
+    # 鞋带公式，points为(..., n, 2)数组，逆时针为正
+    points = np.asarray(points, dtype=np.float64)
+    x = points[..., 0]
+    y = points[..., 1]
+    return 0.5 * np.sum(x * np.roll(y, -1, axis=-1) - np.roll(x, -1, axis=-1) * y, axis=-1)
+
+
+def to_point_dicts(points):
+    # 仅在序列化时转换为 [{"x":..,"y":..}] 格式
+    return [{"x": x, "y": y} for x, y in np.asarray(points, dtype=np.float64).tolist()]
+
+
+def from_point_dicts(point_list):
+    return np.array([(p["x"], p["y"]) for p in point_list], dtype=np.float64).reshape(-1, 2)
+
+
+def _point_segment_distance(points, start, end):
+    # 各点到线段（不是其所在直线）的距离：投影限制在线段两端之间，折返的路径也不会超出容差
+    direction = end - start
+    length_squared = direction[0] ** 2 + direction[1] ** 2
+    offset = points - start
+    if length_squared == 0:
+        return np.hypot(offset[:, 0], offset[:, 1])
+    t = np.clip((offset[:, 0] * direction[0] + offset[:, 1] * direction[1]) / length_squared, 0.0, 1.0)
+    return np.hypot(offset[:, 0] - t * direction[0], offset[:, 1] - t * direction[1])
+
+
+def simplify_points(points, tolerance, closed=False):
+    """
+    Douglas–Peucker 折线/多边形简化，每段的距离计算都是一次数组运算。
+
+    :param points: (n, 2) 数组
+    :param tolerance: 允许的最大偏离距离（米）
+    :param closed: True表示多边形（首尾相连），结果至少保留3个点
+    :return: 简化后的 (m, 2) 数组，保留点的原始顺序
+    """
+    points = np.asarray(points, dtype=np.float64)
+    n_points = len(points)
+    if n_points < 3 or tolerance <= 0:
+        return points.copy()
+
+    keep = np.zeros(n_points, dtype=bool)
+    if closed:
+        # 以第一个点和距其最远的点把多边形拆成两条折线，末尾补上首点以处理闭合边
+        far = int(np.argmax(np.sum((points - points[0]) ** 2, axis=1)))
+        chain = np.vstack([points, points[:1]])
+        keep[[0, far]] = True
+        stack = [(0, far), (far, n_points)]
+    else:
+        chain = points
+        keep[[0, n_points - 1]] = True
+        stack = [(0, n_points - 1)]
+
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        distances = _point_segment_distance(chain[start + 1:end], chain[start], chain[end])
+        i = int(np.argmax(distances))
+        if distances[i] > tolerance:
+            index = start + 1 + i
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+
+    if closed and keep.sum() < 3:
+        # 多边形退化时保留距首点-最远点连线最远的点
+        candidates = np.flatnonzero(~keep)
+        distances = _point_segment_distance(points[candidates], points[0], points[far])
+        keep[candidates[int(np.argmax(distances))]] = True
+    return points[keep]
+
+
+def bounding_box(points):
+    points = np.asarray(points, dtype=np.float64)
+    return np.concatenate([points.min(axis=0), points.max(axis=0)])
+
+
+def points_in_polygon(points, polygon):
+    # 射线法，一次判断多个点是否在多边形内（边界上的点结果不确定）
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    polygon = np.asarray(polygon, dtype=np.float64)
+    x, y = points[:, 0:1], points[:, 1:2]
+    x1, y1 = polygon[:, 0], polygon[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    crosses = (y1 > y) != (y2 > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+    return np.count_nonzero(crosses & (x < x_cross), axis=1) % 2 == 1
+
+
+def _edges(points, closed):
+    points = np.asarray(points, dtype=np.float64)
+    end = np.roll(points, -1, axis=0) if closed else points[1:]
+    return points[:len(end)], end
+
+
+def _edges_in_box(start, end, box):
+    return ((np.maximum(start[:, 0], end[:, 0]) >= box[0]) & (np.minimum(start[:, 0], end[:, 0]) <= box[2]) &
+            (np.maximum(start[:, 1], end[:, 1]) >= box[1]) & (np.minimum(start[:, 1], end[:, 1]) <= box[3]))
+
+
+def _cross(o, a, b):
+    return (a[..., 0] - o[..., 0]) * (b[..., 1] - o[..., 1]) - (a[..., 1] - o[..., 1]) * (b[..., 0] - o[..., 0])
+
+
+def edges_cross(points_a, points_b, closed_a=True, closed_b=True, chunk_size=2048):
+    """
+    判断两条折线/多边形的边是否存在真正相交（不含端点接触和共线重叠）。
+
+    先按对方的包围盒过滤边，再对候选边两两做向量化的方向测试。
+    """
+    a_start, a_end = _edges(points_a, closed_a)
+    b_start, b_end = _edges(points_b, closed_b)
+    mask_a = _edges_in_box(a_start, a_end, bounding_box(points_b))
+    mask_b = _edges_in_box(b_start, b_end, bounding_box(points_a))
+    a_start, a_end, b_start, b_end = a_start[mask_a], a_end[mask_a], b_start[mask_b], b_end[mask_b]
+    if not len(a_start) or not len(b_start):
+        return False
+    for i in range(0, len(a_start), chunk_size):
+        p1, p2 = a_start[i:i + chunk_size, None], a_end[i:i + chunk_size, None]
+        d1 = _cross(b_start, b_end, p1)
+        d2 = _cross(b_start, b_end, p2)
+        d3 = _cross(p1, p2, b_start)
+        d4 = _cross(p1, p2, b_end)
+        if np.any((d1 * d2 < 0) & (d3 * d4 < 0)):
+            return True
+    return False
+
+
+# 点-边候选对每块最多处理的数量，限制内存占用
+_BLOCK_ELEMENTS = 1 << 22
+
+
+def _near_edge_pairs(points, start, end, eps):
+    """
+    分块产生 (点下标, 边下标) 候选对：只保留 x 方向上距离不超过 eps 的点和边。
+
+    边按左端 x 排序，每个点只需检查左端落在 [x - 最大边宽 - eps, x + eps] 内的边，避免点×边全量计算。
+    """
+    min_x = np.minimum(start[:, 0], end[:, 0])
+    max_x = np.maximum(start[:, 0], end[:, 0])
+    order = np.argsort(min_x, kind="stable")
+    sorted_min_x = min_x[order]
+    width = float(np.max(max_x - min_x)) if len(start) else 0.0
+    low = np.searchsorted(sorted_min_x, points[:, 0] - width - eps, side="left")
+    high = np.searchsorted(sorted_min_x, points[:, 0] + eps, side="right")
+    counts = high - low
+    ends = np.cumsum(counts)
+    first = 0
+    while first < len(points):
+        # 每块包含的点，使候选对总数不超过 _BLOCK_ELEMENTS
+        last = max(first + 1, int(np.searchsorted(ends, ends[first] - counts[first] + _BLOCK_ELEMENTS, side="right")))
+        block_counts = counts[first:last]
+        point_index = np.repeat(np.arange(first, last), block_counts)
+        offsets = np.arange(len(point_index)) - np.repeat(np.cumsum(block_counts) - block_counts, block_counts)
+        edge_index = order[np.repeat(low[first:last], block_counts) + offsets]
+        keep = max_x[edge_index] >= points[point_index, 0] - eps
+        yield point_index[keep], edge_index[keep]
+        first = last
+
+
+def _distances_to_edges(points, start, end, eps):
+    # 各点到一组线段的最近距离；只计算 x 方向相距 eps 以内的边，更远的点结果为 inf
+    result = np.full(len(points), np.inf)
+    direction = end - start
+    length_squared = np.maximum(np.sum(direction ** 2, axis=1), np.finfo(np.float64).tiny)
+    for point_index, edge_index in _near_edge_pairs(points, start, end, eps):
+        offset = points[point_index] - start[edge_index]
+        d = direction[edge_index]
+        t = np.clip(np.sum(offset * d, axis=1) / length_squared[edge_index], 0.0, 1.0)
+        np.minimum.at(result, point_index, np.hypot(offset[:, 0] - t * d[:, 0], offset[:, 1] - t * d[:, 1]))
+    return result
+
+
+def _boundary_samples(polygon, other, eps):
+    """
+    在 polygon 的边上取样：每条边在 other 的顶点处（顶点落在边上时）切开，取每一小段的中点。
+
+    两个多边形的边没有真正相交时，每一小段要么整段在 other 的边界上，要么整段在其内部或外部，中点即可代表整段。
+    """
+    start, end = _edges(polygon, True)
+    direction = end - start
+    length = np.maximum(np.hypot(direction[:, 0], direction[:, 1]), np.finfo(np.float64).tiny)
+    vertices = np.asarray(other, dtype=np.float64)
+    edge_index = [np.arange(len(start)), np.arange(len(start))]
+    params = [np.zeros(len(start)), np.ones(len(start))]
+    for vertex_index, edges in _near_edge_pairs(vertices, start, end, eps):
+        offset = vertices[vertex_index] - start[edges]
+        d = direction[edges]
+        t = np.sum(offset * d, axis=1) / length[edges] ** 2
+        distance = np.abs(d[:, 0] * offset[:, 1] - d[:, 1] * offset[:, 0]) / length[edges]
+        on_edge = (t > 0) & (t < 1) & (distance <= eps)
+        edge_index.append(edges[on_edge])
+        params.append(t[on_edge])
+    edge_index = np.concatenate(edge_index)
+    params = np.concatenate(params)
+    order = np.lexsort((params, edge_index))
+    edge_index, params = edge_index[order], params[order]
+    same_edge = edge_index[1:] == edge_index[:-1]
+    edges = edge_index[1:][same_edge]
+    middle = (params[1:] + params[:-1])[same_edge] / 2
+    return start[edges] + middle[:, None] * direction[edges]
+
+
+def polygons_overlap(polygon_a, polygon_b):
+    """
+    判断两个多边形的内部是否相交（重叠面积大于0）：只共用边或顶点不算重叠，完全相同、互相包含算重叠。
+
+    边没有真正相交时，只有 A 的边界穿过 B 的内部、B 的边界穿过 A 的内部，或两者边界完全重合（同一个区域）时内部才会相交，
+    所以只需检查两者边界上的取样点。
+    """
+    polygon_a = np.asarray(polygon_a, dtype=np.float64)
+    polygon_b = np.asarray(polygon_b, dtype=np.float64)
+    if edges_cross(polygon_a, polygon_b):
+        return True
+    box_a, box_b = bounding_box(polygon_a), bounding_box(polygon_b)
+    if np.any(box_a[:2] > box_b[2:]) or np.any(box_b[:2] > box_a[2:]):
+        return False
+    # 判断点是否在边界上的容差，按坐标范围缩放
+    eps = 1e-9 * max(1.0, float(np.max(np.abs(np.concatenate([box_a, box_b])))))
+    all_on_boundary = True
+    for polygon, other, other_box in ((polygon_a, polygon_b, box_b), (polygon_b, polygon_a, box_a)):
+        samples = _boundary_samples(polygon, other, eps)
+        # 对方包围盒之外的取样点既不在其内部也不在其边界上
+        in_box = np.all((samples >= other_box[:2] - eps) & (samples <= other_box[2:] + eps), axis=1)
+        if not np.all(in_box):
+            all_on_boundary = False
+        samples = samples[in_box]
+        start, end = _edges(other, True)
+        on_boundary = _distances_to_edges(samples, start, end, eps) <= eps
+        inside = samples[~on_boundary]
+        # 射线法是点×边的全量计算，分块限制内存
+        step = max(1, _BLOCK_ELEMENTS // len(other))
+        for i in range(0, len(inside), step):
+            if np.any(points_in_polygon(inside[i:i + step], other)):
+                return True
+        all_on_boundary = all_on_boundary and bool(np.all(on_boundary))
+    return all_on_boundary
+
+
+def polyline_inside(points, polygon, closed=True):
+    # 所有顶点都在多边形内且没有边穿出
+    if not np.all(points_in_polygon(points, polygon)):
+        return False
+    return not edges_cross(points, polygon, closed_a=closed)
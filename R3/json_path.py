@@ -0,0 +1,162 @@
+import copy
+import re
+from functools import lru_cache
+
+# 简单路径：$、.name、['name']、["name"]、[0]
+_SIMPLE_TOKEN = re.compile(r"""\.([A-Za-z_][\w\-]*)|\[(-?\d+)\]|\['([^']*)'\]|\["([^"]*)"\]""")
+
+
+class _ComplexPath:
+    # 通配符、过滤器等复杂表达式交给 jsonpath_ng 处理
+    def __init__(self, json_path, expr):
+        self.json_path = json_path
+        self.expr = expr
+
+
+@lru_cache(maxsize=1024)
+def compile_path(json_path):
+    """
+    编译JSON Path，结果会被缓存。
+
+    :return: 简单路径返回键/索引组成的元组，复杂路径返回 jsonpath_ng 表达式的包装
+    """
+    if not json_path.startswith("$"):
+        return _compile_complex(json_path)
+    keys = []
+    pos = 1
+    while pos < len(json_path):
+        m = _SIMPLE_TOKEN.match(json_path, pos)
+        if not m:
+            return _compile_complex(json_path)
+        name, index, quoted1, quoted2 = m.groups()
+        if index is not None:
+            keys.append(int(index))
+        else:
+            keys.append(next(x for x in (name, quoted1, quoted2) if x is not None))
+        pos = m.end()
+    return tuple(keys)
+
+
+def _compile_complex(json_path):
+    # jsonpath_ng 导入较慢，只在遇到复杂表达式时才导入
+    from jsonpath_ng import parse
+
+    try:
+        return _ComplexPath(json_path, parse(json_path))
+    except Exception as e:
+        raise ValueError(f"无效的JSON Path表达式: {json_path}") from e
+
+
+def _child(node, key, json_path):
+    try:
+        if isinstance(node, dict):
+            if isinstance(key, int) or key not in node:
+                raise KeyError(key)
+        elif isinstance(node, list):
+            if not isinstance(key, int):
+                raise KeyError(key)
+        else:
+            raise KeyError(key)
+        return node[key]
+    except (KeyError, IndexError):
+        raise ValueError(f"在JSON中未找到路径: {json_path}") from None
+
+
+def _shallow_copy(node):
+    return dict(node) if isinstance(node, dict) else list(node)
+
+
+def get_path(json_data, json_path):
+    compiled = compile_path(json_path)
+    if isinstance(compiled, _ComplexPath):
+        matches = compiled.expr.find(json_data)
+        if not matches:
+            raise ValueError(f"在JSON中未找到路径: {json_path}")
+        return matches[0].value
+    node = json_data
+    for key in compiled:
+        node = _child(node, key, json_path)
+    return node
+
+
+def _set_complex(json_data, compiled, value, copy_on_write):
+    from jsonpath_ng import Fields, Index
+
+    # 复杂路径无法只复制路径上的节点，copy模式下退回到深拷贝
+    modified_data = copy.deepcopy(json_data) if copy_on_write else json_data
+
+    matches = compiled.expr.find(modified_data)
+    if not matches:
+        raise ValueError(f"在JSON中未找到路径: {compiled.json_path}")
+
+    # 处理第一个匹配项
+    match = matches[0]
+    if match.context is None:
+        # 匹配的是根节点
+        return value
+    parent = match.context.value
+
+    # 根据路径类型处理不同的访问方式
+    if isinstance(match.path, Fields):
+        parent[match.path.fields[0]] = value
+    elif isinstance(match.path, Index):
+        parent[match.path.index] = value
+    elif hasattr(match.path, 'right'):
+        last_accessor = match.path.right
+        if isinstance(last_accessor, Index):
+            parent[last_accessor.index] = value
+        elif hasattr(last_accessor, 'value'):
+            parent[last_accessor.value] = value
+        else:
+            raise TypeError(f"不支持的访问器类型: {type(last_accessor).__name__}")
+    else:
+        raise TypeError(f"不支持的路径类型: {type(match.path).__name__}")
+    return modified_data
+
+
+def _apply_trie(node, trie, copy_on_write, json_path_of):
+    # trie: {"value": ..., "children": {key: trie}}，一次遍历完成所有修改
+    if "value" in trie:
+        node = trie["value"]
+    children = trie["children"]
+    if not children:
+        return node
+    # 替换的新值也由调用方持有，copy模式下同样先复制再修改其子节点
+    new_node = _shallow_copy(node) if copy_on_write else node
+    for key, sub_trie in children.items():
+        child = _child(new_node, key, json_path_of(sub_trie))
+        new_node[key] = _apply_trie(child, sub_trie, copy_on_write, json_path_of)
+    return new_node
+
+
+def set_paths(json_data, updates, copy=False):
+    """
+    在一次遍历中批量修改多个路径。
+
+    :param updates: {json_path: value} 字典或 (json_path, value) 列表，前缀路径会先于其子路径生效；
+                    子路径出现在其前缀路径之前时抛出 ValueError（修改会被前缀路径的新值覆盖）
+    :param copy: False为原地修改；True为写时复制，只复制被修改路径上的容器，其余节点与原数据共享
+    :return: 修改后的数据（根路径被替换时返回新值）
+    """
+    items = updates.items() if isinstance(updates, dict) else updates
+    trie = {"children": {}}
+    for json_path, value in items:
+        compiled = compile_path(json_path)
+        if isinstance(compiled, _ComplexPath):
+            # 先应用已收集的简单路径，再单独处理复杂路径
+            json_data = _apply_trie(json_data, trie, copy, lambda t: t.get("path", "$"))
+            trie = {"children": {}}
+            json_data = _set_complex(json_data, compiled, value, copy)
+            continue
+        node = trie
+        for key in compiled:
+            node = node["children"].setdefault(key, {"children": {}, "path": json_path})
+        if node["children"]:
+            raise ValueError(f"路径 {json_path} 出现在其子路径 {next(iter(node['children'].values()))['path']} 之后，"
+                             f"子路径的修改会被覆盖")
+        node["value"] = value
+    return _apply_trie(json_data, trie, copy, lambda t: t.get("path", "$"))
+
+
+def set_path(json_data, json_path, value, copy=False):
+    return set_paths(json_data, ((json_path, value),), copy=copy)
@@ -0,0 +1,167 @@
+import os
+from json_path import get_path
+from map_io import load_json, write_json
+
+MAP_SUFFIXES = (".object", ".map", ".points.json")
+DEFINITION_FILE = "definition.json"
+
+
+class MapFolder:
+    """
+    地图文件夹的内存索引：扫描一次目录，按需解析并缓存文件，
+    通过 mtime/size 判断磁盘文件是否变化，save() 时只写回修改过的文件。
+
+    缓存的文档由多个调用方共享，应视为只读；修改请使用写时复制（json_path.set_paths(..., copy=True)）
+    后通过 put_* 放回。
+    """
+
+    def __init__(self, path, create=False):
+        if create:
+            os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._stats = {}  # filename -> (mtime_ns, size)，扫描时记录
+        self._cache = {}  # filename -> (stat, data)
+        self._dirty = set()
+        self._types = None  # object_type -> [name]，首次按类型查询时建立
+        self.scan()
+
+    def __repr__(self):
+        return f"MapFolder({self.path!r})"
+
+    def _is_map_file(self, filename):
+        return not filename.startswith(".") and (filename.endswith(MAP_SUFFIXES) or filename == DEFINITION_FILE)
+
+    def scan(self):
+        # 重新扫描目录，磁盘上已删除的文件从缓存中移除（未保存的修改保留）
+        stats = {}
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if entry.is_file() and self._is_map_file(entry.name):
+                    stat = entry.stat()
+                    stats[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        for filename in list(self._cache):
+            if filename not in stats and filename not in self._dirty:
+                del self._cache[filename]
+        self._stats = stats
+        self._types = None
+
+    def _stat(self, filename):
+        try:
+            stat = os.stat(os.path.join(self.path, filename))
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def exists(self, filename):
+        return filename in self._dirty or filename in self._stats
+
+    def read(self, filename):
+        if filename in self._dirty:
+            return self._cache[filename][1]
+        stat = self._stat(filename)
+        if stat is None:
+            raise FileNotFoundError(os.path.join(self.path, filename))
+        cached = self._cache.get(filename)
+        if cached is None or cached[0] != stat:
+            cached = (stat, load_json(os.path.join(self.path, filename)))
+            self._cache[filename] = cached
+            self._stats[filename] = stat
+            if filename.endswith(".object"):
+                self._types = None
+        return cached[1]
+
+    def write(self, filename, data):
+        # 只写入内存并标记为待保存
+        self._cache[filename] = (None, data)
+        self._stats.setdefault(filename, None)
+        self._dirty.add(filename)
+        if filename.endswith(".object"):
+            self._types = None
+
+    def list_files(self, suffix):
+        return sorted(filename for filename in set(self._stats) | self._dirty if filename.endswith(suffix))
+
+    def object_names(self):
+        return [filename[:-len(".object")] for filename in self.list_files(".object")]
+
+    def get_object(self, name):
+        return self.read(f"{name}.object")
+
+    def put_object(self, name, data):
+        self.write(f"{name}.object", data)
+
+    def get_map(self, name):
+        return self.read(f"{name}.map")
+
+    def put_map(self, name, data):
+        self.write(f"{name}.map", data)
+
+    def get_definition(self):
+        return self.read(DEFINITION_FILE)
+
+    def put_definition(self, data):
+        self.write(DEFINITION_FILE, data)
+
+    def names_by_type(self, object_type):
+        if self._types is None:
+            types = {}
+            for name in self.object_names():
+                types.setdefault(get_path(self.get_object(name), "$.header.type.type"), []).append(name)
+            self._types = types
+        return list(self._types.get(object_type, []))
+
+    @property
+    def dirty(self):
+        return sorted(self._dirty)
+
+    def save(self):
+        """
+        把修改过的文件写回磁盘（原子写入）。
+
+        :return: 写入的文件名列表
+        """
+        written = []
+        for filename in sorted(self._dirty):
+            data = self._cache[filename][1]
+            write_json(os.path.join(self.path, filename), data)
+            stat = self._stat(filename)
+            self._cache[filename] = (stat, data)
+            self._stats[filename] = stat
+            written.append(filename)
+        self._dirty.clear()
+        return written
+
+
+# 以下函数让 generate_map/transform/spatial 中的函数同时接受文件夹路径和 MapFolder
+
+def read_file(folder, filename):
+    if isinstance(folder, MapFolder):
+        return folder.read(filename)
+    return load_json(os.path.join(folder, filename))
+
+
+def write_file(folder, filename, data):
+    # MapFolder 只标记为待保存，需调用 save() 写盘
+    if isinstance(folder, MapFolder):
+        folder.write(filename, data)
+    else:
+        write_json(os.path.join(folder, filename), data)
+
+
+def folder_path(folder):
+    # 非JSON文件（如 point_store 的 .points.npy）不经过缓存，直接读写磁盘上的文件夹
+    return folder.path if isinstance(folder, MapFolder) else folder
+
+
+def file_exists(folder, filename):
+    if isinstance(folder, MapFolder):
+        return folder.exists(filename)
+    return os.path.exists(os.path.join(folder, filename))
+
+
+def list_files(folder, suffix):
+    if isinstance(folder, MapFolder):
+        return folder.list_files(suffix)
+    with os.scandir(folder) as entries:
+        return sorted(entry.name for entry in entries
+                      if entry.is_file() and not entry.name.startswith(".") and entry.name.endswith(suffix))
@@ -0,0 +1,204 @@
+import json
+import math
+import os
+import time
+import uuid
+from json_path import set_path
+
+try:
+    import orjson
+except ImportError:  # 未安装时退回标准库
+    orjson = None
+
+_SEPARATORS = (",", ":")
+
+_backend = "orjson" if orjson is not None else "stdlib"
+
+
+def available_backends():
+    return ["orjson", "stdlib"] if orjson is not None else ["stdlib"]
+
+
+def get_backend():
+    return _backend
+
+
+def set_backend(name):
+    global _backend
+    if name not in available_backends():
+        raise ValueError(f"JSON后端不可用: {name}，可用后端: {available_backends()}")
+    _backend = name
+
+
+def _find_all(output, sub):
+    pos = output.find(sub)
+    while pos != -1:
+        yield pos
+        pos = output.find(sub, pos + 1)
+
+
+def _orjson_compatible(output):
+    # 标准库会转义非ASCII字符和 DEL（U+007F），orjson 原样输出
+    if not output.isascii() or b"\x7f" in output:
+        return False
+    # 科学计数法：orjson 输出 1e16，标准库输出 1e+16
+    for pos in _find_all(output, b"e"):
+        if output[pos - 1:pos].isdigit():
+            return False
+    # 1e-5 量级的小数：orjson 输出 0.00001，标准库输出 1e-05
+    for pos in _find_all(output, b"0.0000"):
+        if pos == 0 or output[pos - 1:pos] not in b"0123456789.":
+            return False
+    return True
+
+
+def _has_non_finite(data):
+    # orjson 把 NaN/Infinity 写成 null，标准库写成 NaN/Infinity
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+def _stdlib_dumps(data):
+    return json.dumps(data, indent=None, separators=_SEPARATORS).encode("ascii")
+
+
+def dumps(data, backend=None):
+    """
+    序列化为紧凑JSON字节串，无论使用哪个后端，输出都与
+    json.dumps(data, indent=None, separators=(",", ":")) 逐字节一致。
+    """
+    if (backend or _backend) == "orjson":
+        try:
+            output = orjson.dumps(data)
+        except TypeError:  # 超过64位的整数、非字符串键等
+            return _stdlib_dumps(data)
+        # 输出格式与标准库不同时，交给标准库重新序列化；只有输出含 null 时才需要检查非有限浮点数
+        if _orjson_compatible(output) and not (b"null" in output and _has_non_finite(data)):
+            return output
+    return _stdlib_dumps(data)
+
+
+def loads(content, backend=None):
+    if (backend or _backend) == "orjson":
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:  # 例如超过64位的整数
+            pass
+    return json.loads(content)
+
+
+def load_json(path, backend=None):
+    with open(path, 'rb') as file:
+        return loads(file.read(), backend)
+
+
+def _atomic_write(path, write):
+    # 先写临时文件再重命名，避免半写入的文件被下发到割草机
+    folder, name = os.path.split(path)
+    temp_path = os.path.join(folder, f".{name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(temp_path, 'xb') as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def write_json(path, data, backend=None):
+    content = dumps(data, backend)
+    _atomic_write(path, lambda file: file.write(content))
+
+
+def write_npy(path, array):
+    # numpy 数组同样原子写入（.npy 格式）
+    import numpy as np
+
+    _atomic_write(path, lambda file: np.save(file, array))
+
+
+def _iter_point_chunks(points, chunk_size):
+    # points 可以是(n, 2)数组、(x, y)序列或点字典序列，按块转换为点字典，避免一次性构建全部字典
+    if hasattr(points, "shape"):
+        for start in range(0, len(points), chunk_size):
+            yield [{"x": x, "y": y} for x, y in points[start:start + chunk_size].tolist()]
+        return
+    chunk = []
+    for point in points:
+        chunk.append(point if isinstance(point, dict) else {"x": point[0], "y": point[1]})
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_object_streaming(path, data, points, json_path="$.area.points", chunk_size=10000, backend=None):
+    """
+    流式写入大点集对象：文档其余部分正常序列化，points 按块编码写入，输出与整体序列化一致。
+
+    :param data: 对象文档（json_path 处的原值会被忽略，不会修改原文档）
+    :param points: (n, 2) 数组或可迭代的点
+    """
+    marker = f"__points_{uuid.uuid4().hex}__"
+    head, tail = dumps(set_path(data, json_path, marker, copy=True), backend).split(f'"{marker}"'.encode("ascii"), 1)
+
+    def write(file):
+        file.write(head)
+        file.write(b"[")
+        first = True
+        for chunk in _iter_point_chunks(points, chunk_size):
+            if not first:
+                file.write(b",")
+            file.write(dumps(chunk, backend)[1:-1])
+            first = False
+        file.write(b"]")
+        file.write(tail)
+
+    _atomic_write(path, write)
+
+
+def benchmark_backends(data, repeat=5):
+    """
+    对比各后端的序列化/反序列化耗时（秒，取最小值）。
+
+    :return: {backend: {"dumps": seconds, "loads": seconds, "bytes": size}}
+    """
+    result = {}
+    content = _stdlib_dumps(data)
+    for backend in available_backends():
+        dump_times, load_times = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = dumps(data, backend)
+            dump_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            loads(content, backend)
+            load_times.append(time.perf_counter() - start)
+        if output != content:
+            raise AssertionError(f"{backend} 的输出与标准库不一致")
+        result[backend] = {"dumps": min(dump_times), "loads": min(load_times), "bytes": len(output)}
+    return result
+
+
+if __name__ == '__main__':
+    from geometry import circle_points, to_point_dicts
+
+    sample = load_json("map/template/MZ001.object")
+    for n_points in (1000, 100000):
+        sample["area"]["points"] = to_point_dicts(circle_points(50, 50, 1000, n_points))
+        for backend, timing in benchmark_backends(sample).items():
+            print(f"{n_points} points {backend}: dumps {timing['dumps'] * 1000:.2f} ms, "
+                  f"loads {timing['loads'] * 1000:.2f} ms, {timing['bytes']} bytes")
@@ -0,0 +1,120 @@
+import os
+import numpy as np
+from geometry import from_point_dicts
+from json_path import get_path, set_path
+from map_folder import MapFolder, folder_path, list_files, read_file, write_file
+from map_io import write_json, write_npy, write_object_streaming
+from transform import POINT_FIELDS
+
+POINTS_SUFFIX = ".points.npy"
+META_SUFFIX = ".points.json"
+
+
+class CompactObject:
+    """
+    紧凑的地图对象：点保存在连续的 (n, 2) float64/float32 数组中，其余字段保留为普通文档。
+
+    磁盘上对应两个旁路文件：{name}.points.npy（可内存映射）和 {name}.points.json（去掉点的文档）。
+    只有发布到割草机时才通过 export() 还原为 .object JSON；float64 可逐字节还原，float32 会损失精度。
+    """
+
+    def __init__(self, data, json_path=None, points=None):
+        self.data = data  # 点字段已置为 None 的文档
+        self.json_path = json_path
+        self.points = points
+
+    @property
+    def name(self):
+        return get_path(self.data, "$.header.name")
+
+    @property
+    def object_type(self):
+        return get_path(self.data, "$.header.type.type")
+
+    @classmethod
+    def from_object(cls, data, dtype=np.float64):
+        json_path = POINT_FIELDS.get(get_path(data, "$.header.type.type"))
+        if json_path is None or get_path(data, json_path) is None:
+            return cls(data)
+        points = from_point_dicts(get_path(data, json_path)).astype(dtype, copy=False)
+        return cls(set_path(data, json_path, None, copy=True), json_path, points)
+
+    def to_object(self):
+        # 构建完整的 .object 文档（会为每个点创建字典，大对象请用 export）
+        if self.json_path is None:
+            return self.data
+        point_list = [{"x": x, "y": y} for x, y in np.asarray(self.points, dtype=np.float64).tolist()]
+        return set_path(self.data, self.json_path, point_list, copy=True)
+
+    def save(self, folder, name=None):
+        """
+        :param folder: 文件夹路径或 MapFolder；.points.npy 立即原子写入磁盘，
+                       .points.json 对 MapFolder 只标记为待保存，需调用其 save()
+        """
+        name = name or self.name
+        meta = {"json_path": self.json_path, "data": self.data}
+        # 先写点数组再写文档：中途退出时旧文档不会指向写了一半的数组
+        if self.points is not None:
+            write_npy(os.path.join(folder_path(folder), f"{name}{POINTS_SUFFIX}"), np.ascontiguousarray(self.points))
+        write_file(folder, f"{name}{META_SUFFIX}", meta)
+
+    @classmethod
+    def load(cls, folder, name, mmap=True):
+        """
+        :param folder: 文件夹路径或 MapFolder
+        :param mmap: True时点数组以只读内存映射方式打开，不把数据读入内存
+        """
+        meta = read_file(folder, f"{name}{META_SUFFIX}")
+        points = None
+        if meta["json_path"] is not None:
+            points = np.load(os.path.join(folder_path(folder), f"{name}{POINTS_SUFFIX}"),
+                             mmap_mode="r" if mmap else None)
+        return cls(meta["data"], meta["json_path"], points)
+
+    def export(self, path, chunk_size=10000):
+        # 流式写出与原格式一致的 .object 文件，不一次性构建全部点字典
+        if self.json_path is None:
+            write_json(path, self.data)
+        else:
+            write_object_streaming(path, self.data, np.asarray(self.points, dtype=np.float64), self.json_path, chunk_size)
+
+
+def compact_names(folder):
+    return [filename[:-len(META_SUFFIX)] for filename in list_files(folder, META_SUFFIX)]
+
+
+def compact_folder(folder, output_folder=None, dtype=np.float64):
+    """
+    把文件夹中所有 .object 转换为紧凑格式，写在 output_folder（默认与原文件并列），
+    输出到其他文件夹时同时复制 .map 和 definition.json。
+
+    :return: 转换的对象名列表
+    """
+    output_folder = output_folder or folder
+    names = []
+    for filename in list_files(folder, ".object"):
+        name = filename[:-len(".object")]
+        CompactObject.from_object(read_file(folder, filename), dtype).save(output_folder, name)
+        names.append(name)
+    if output_folder != folder:
+        for filename in list_files(folder, ".map") + ["definition.json"]:
+            write_file(output_folder, filename, read_file(folder, filename))
+    return names
+
+
+def publish_folder(compact_folder_path, output_folder, chunk_size=10000):
+    """
+    把紧凑格式还原为割草机使用的 .object JSON，并复制 .map 和 definition.json。
+
+    :return: 导出的对象名列表
+    """
+    names = compact_names(compact_folder_path)
+    for name in names:
+        CompactObject.load(compact_folder_path, name).export(
+            os.path.join(folder_path(output_folder), f"{name}.object"), chunk_size)
+    if isinstance(output_folder, MapFolder):
+        # .object 已直接写入磁盘，重新扫描让索引包含这些文件
+        output_folder.scan()
+    for filename in list_files(compact_folder_path, ".map") + ["definition.json"]:
+        write_file(output_folder, filename, read_file(compact_folder_path, filename))
+    return names
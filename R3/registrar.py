@@ -4,7 +4,8 @@ import logging
 import io
 import threading
 import uuid
-from logger_config import get_logger, TextHandler
+from http_cassette import cassette_from_env
+from logger_config import attach_handler, get_logger, TextHandler
 from datetime import datetime
 from tkinter import ttk
 from tkinter import scrolledtext
@@ -125,7 +126,8 @@ class MyApp(tk.Tk):
         super().__init__()
         self.log_handler = None
         self.xlink_vehicle = None
-        self.logger = get_logger()
+        # 日志经队列由单独线程输出，工作线程不会阻塞在控制台和Tk控件上
+        self.logger = get_logger(queued=True)
         self.logger.setLevel(logging.DEBUG)
         self.tasks = list()
 
@@ -244,7 +246,7 @@ class MyApp(tk.Tk):
         i += 1
 
         # 创建自定义日志处理器
-        self.log_handler = TextHandler(self.log_widget)
+        self.log_handler = TextHandler(self.log_widget, poll_interval=100)
 
         # 设置日志格式
         formatter = logging.Formatter('%(asctime)s - %(levelname)s: %(message)s')
@@ -252,7 +254,7 @@ class MyApp(tk.Tk):
 
         # 获取根日志记录器并添加处理器
         self.logger.setLevel(logging.INFO)
-        self.logger.addHandler(self.log_handler)
+        attach_handler(self.logger, self.log_handler)
 
         def clear():
             self.log_widget.configure(state='normal')
@@ -269,4 +271,6 @@ class MyApp(tk.Tk):
 if __name__ == "__main__":
     pass
     app = MyApp()
-    app.mainloop()
+    # 设置环境变量 HTTP_CASSETTE 可录制或离线回放HTTP请求，见 http_cassette.cassette_from_env
+    with cassette_from_env():
+        app.mainloop()
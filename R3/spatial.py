@@ -0,0 +1,150 @@
+from collections import defaultdict
+import numpy as np
+from geometry import bounding_box, polygon_area, polygons_overlap, polyline_inside
+from json_path import get_path
+from map_folder import list_files, read_file
+
+# 对象类型 -> (点字段, 是否闭合)
+GEOMETRY_FIELDS = {1: ("$.area.points", True), 3: ("$.area.points", True), 4: ("$.transport_path.points", False)}
+
+
+class MapSpatialIndex:
+    """
+    地图级空间索引：对象包围盒放入均匀网格，只对包围盒相交的候选对做精确多边形相交测试。
+    """
+
+    def __init__(self, objects, cell_size=None):
+        """
+        :param objects: [(name, object_type, points), ...]，points 为 (n, 2) 数组
+        :param cell_size: 网格边长（米），默认取包围盒边长的中位数
+        """
+        self.names = [name for name, _, _ in objects]
+        self.types = np.array([object_type for _, object_type, _ in objects], dtype=np.int64)
+        self.points = [np.asarray(points, dtype=np.float64) for _, _, points in objects]
+        self.closed = np.array([GEOMETRY_FIELDS.get(object_type, (None, True))[1] for _, object_type, _ in objects], dtype=bool)
+        self.bboxes = np.array([bounding_box(points) for points in self.points], dtype=np.float64).reshape(-1, 4)
+        self.areas = np.array([abs(polygon_area(points)) if closed else 0.0
+                               for points, closed in zip(self.points, self.closed)], dtype=np.float64)
+
+        if cell_size is None:
+            sizes = np.maximum(self.bboxes[:, 2] - self.bboxes[:, 0], self.bboxes[:, 3] - self.bboxes[:, 1])
+            cell_size = float(np.median(sizes)) if len(sizes) else 1.0
+        self.cell_size = cell_size if cell_size > 0 else 1.0
+
+        self.grid = defaultdict(list)
+        for i, (x0, y0, x1, y1) in enumerate(self._cell_ranges(self.bboxes)):
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    self.grid[(cx, cy)].append(i)
+
+    @classmethod
+    def from_folder(cls, folder, object_types=(1, 3), cell_size=None):
+        # 读取文件夹中所有 .object 文件，只索引指定类型的对象
+        objects = []
+        for filename in list_files(folder, ".object"):
+            data = read_file(folder, filename)
+            object_type = get_path(data, "$.header.type.type")
+            if object_type not in object_types or object_type not in GEOMETRY_FIELDS:
+                continue
+            point_list = get_path(data, GEOMETRY_FIELDS[object_type][0])
+            if not point_list:
+                continue
+            points = np.array([(p["x"], p["y"]) for p in point_list], dtype=np.float64)
+            objects.append((get_path(data, "$.header.name"), object_type, points))
+        return cls(objects, cell_size)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _cell_ranges(self, bboxes):
+        return np.floor(bboxes / self.cell_size).astype(np.int64).tolist()
+
+    def query_bbox(self, bbox):
+        # 返回包围盒与 bbox 相交的对象下标
+        x0, y0, x1, y1 = self._cell_ranges(np.asarray(bbox, dtype=np.float64))
+        candidates = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                candidates.update(self.grid.get((cx, cy), ()))
+        candidates = np.array(sorted(candidates), dtype=np.int64)
+        if not len(candidates):
+            return candidates
+        boxes = self.bboxes[candidates]
+        hit = (boxes[:, 0] <= bbox[2]) & (boxes[:, 2] >= bbox[0]) & (boxes[:, 1] <= bbox[3]) & (boxes[:, 3] >= bbox[1])
+        return candidates[hit]
+
+    def candidate_pairs(self):
+        # 同一网格内的对象两两组合，去重后再用包围盒过滤
+        pairs = set()
+        for members in self.grid.values():
+            for k, i in enumerate(members):
+                for j in members[k + 1:]:
+                    pairs.add((i, j) if i < j else (j, i))
+        if not pairs:
+            return np.empty((0, 2), dtype=np.int64)
+        pairs = np.array(sorted(pairs), dtype=np.int64)
+        a, b = self.bboxes[pairs[:, 0]], self.bboxes[pairs[:, 1]]
+        hit = (a[:, 0] <= b[:, 2]) & (a[:, 2] >= b[:, 0]) & (a[:, 1] <= b[:, 3]) & (a[:, 3] >= b[:, 1])
+        return pairs[hit]
+
+    def find_overlaps(self, object_types=None):
+        """
+        查找相互重叠的区域对象。
+
+        :param object_types: 只检查这些类型之间的重叠，例如 (1,) 只检查割草区；默认检查全部区域
+        :return: [(name_a, name_b), ...]
+        """
+        overlaps = []
+        for i, j in self.candidate_pairs().tolist():
+            if not (self.closed[i] and self.closed[j]):
+                continue
+            if object_types is not None and (self.types[i] not in object_types or self.types[j] not in object_types):
+                continue
+            if polygons_overlap(self.points[i], self.points[j]):
+                overlaps.append((self.names[i], self.names[j]))
+        return overlaps
+
+    def find_outside(self, boundary):
+        """
+        查找不完全位于场地边界内的对象。
+
+        :param boundary: 场地边界多边形，(n, 2) 数组或点字典列表
+        :return: 对象名列表
+        """
+        if len(boundary) and isinstance(boundary[0], dict):
+            boundary = [(p["x"], p["y"]) for p in boundary]
+        boundary = np.asarray(boundary, dtype=np.float64)
+        box = bounding_box(boundary)
+        inside_box = ((self.bboxes[:, 0] >= box[0]) & (self.bboxes[:, 1] >= box[1]) &
+                      (self.bboxes[:, 2] <= box[2]) & (self.bboxes[:, 3] <= box[3]))
+        outside = []
+        for i in range(len(self)):
+            if not inside_box[i] or not polyline_inside(self.points[i], boundary, self.closed[i]):
+                outside.append(self.names[i])
+        return outside
+
+    def area_by_name(self):
+        return dict(zip(self.names, self.areas.tolist()))
+
+
+def validate_map_folder(folder, site_boundary=None, object_types=(1, 3), overlap_types=None):
+    """
+    校验地图文件夹：区域重叠、超出场地边界，并用鞋带公式统计面积。
+
+    :return: {"overlaps": [...], "outside": [...], "areas": {name: area}}
+    """
+    index = MapSpatialIndex.from_folder(folder, object_types)
+    result = {
+        "overlaps": index.find_overlaps(overlap_types),
+        "outside": index.find_outside(site_boundary) if site_boundary is not None else [],
+        "areas": index.area_by_name(),
+    }
+    print(f"Validated {len(index)} objects in {folder}: {len(result['overlaps'])} overlaps, "
+          f"{len(result['outside'])} outside the site")
+    return result
+
+
+if __name__ == '__main__':
+    report = validate_map_folder("map/template", overlap_types=(1,))
+    for name_a, name_b in report["overlaps"]:
+        print(f"{name_a} overlaps {name_b}")
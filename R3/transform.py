@@ -0,0 +1,131 @@
+import math
+import time
+import numpy as np
+from geometry import from_point_dicts, to_point_dicts
+from json_path import get_path, set_path, set_paths
+from map_folder import list_files, read_file, write_file
+
+# 对象类型 -> 点列表字段
+POINT_FIELDS = {1: "$.area.points", 3: "$.area.points", 4: "$.transport_path.points"}
+# 对象类型 -> 单点字段（充电站/停车点）
+WAYPOINT_TYPES = (5, 6)
+
+
+def translation(offset_x, offset_y):
+    return np.array([[1, 0, offset_x], [0, 1, offset_y], [0, 0, 1]], dtype=np.float64)
+
+
+def _about_pivot(linear, pivot):
+    # 以 pivot 为中心应用线性变换：平移到原点 -> 变换 -> 平移回去
+    px, py = pivot
+    matrix = np.eye(3)
+    matrix[:2, :2] = linear
+    return translation(px, py) @ matrix @ translation(-px, -py)
+
+
+def rotation(angle, pivot=(0, 0)):
+    # angle 为逆时针角度（度）
+    radians = math.radians(angle)
+    cos_a, sin_a = math.cos(radians), math.sin(radians)
+    return _about_pivot([[cos_a, -sin_a], [sin_a, cos_a]], pivot)
+
+
+def scaling(scale_x, scale_y=None, pivot=(0, 0)):
+    return _about_pivot([[scale_x, 0], [0, scale_x if scale_y is None else scale_y]], pivot)
+
+
+def mirror(axis="x", pivot=(0, 0)):
+    # axis="x" 沿 pivot 所在的水平线翻转（y取反），axis="y" 沿竖直线翻转（x取反）
+    if axis not in ("x", "y"):
+        raise ValueError(f"不支持的镜像轴: {axis}")
+    return _about_pivot([[1, 0], [0, -1]] if axis == "x" else [[-1, 0], [0, 1]], pivot)
+
+
+def compose(*matrices):
+    # 按参数顺序依次应用
+    result = np.eye(3)
+    for matrix in matrices:
+        result = np.asarray(matrix, dtype=np.float64) @ result
+    return result
+
+
+def apply_affine(points, matrix):
+    """
+    对 (n, 2) 点数组应用3×3仿射矩阵，一次数组运算完成。
+    """
+    points = np.asarray(points, dtype=np.float64)
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if np.array_equal(matrix[:2, :2], np.eye(2)):
+        # 纯平移直接相加，结果与逐点 x + offset_x 完全一致
+        return points + matrix[:2, 2]
+    return points @ matrix[:2, :2].T + matrix[:2, 2]
+
+
+def _transform_heading(heading, matrix):
+    # entry_direction 为方位角（度）：0°指向+y，顺时针为正。模板中 TP001 的最后一段驶入 CS001，
+    # 按此约定方向约为272°，与 CS001 的 entry_direction 274.7°一致（按0°指向+x、逆时针的约定则为178°）
+    radians = math.radians(heading)
+    vx, vy = matrix[:2, :2] @ (math.sin(radians), math.cos(radians))
+    return math.degrees(math.atan2(vx, vy)) % 360
+
+
+def transform_object(data, matrix, new_name=None):
+    """
+    对对象中的所有坐标应用仿射变换，返回新文档（写时复制），不修改原文档。
+
+    区域(1/3)变换 area.points，运输路径(4)变换 transport_path.points，
+    充电站/停车点(5/6)变换 waypoint.location 及 entry_direction（方位角：0°指向+y，顺时针为正）。
+    镜像会反转多边形的环绕方向，此时区域点序会被反转以保持原方向。
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    object_type = get_path(data, "$.header.type.type")
+    updates = {}
+    if object_type in POINT_FIELDS:
+        json_path = POINT_FIELDS[object_type]
+        point_list = get_path(data, json_path)
+        if point_list:
+            points = apply_affine(from_point_dicts(point_list), matrix)
+            if object_type != 4 and np.linalg.det(matrix[:2, :2]) < 0:
+                points = points[::-1]
+            updates[json_path] = to_point_dicts(points)
+
+    elif object_type in WAYPOINT_TYPES:
+        location = get_path(data, "$.waypoint.location")
+        x, y = apply_affine([(location['x'], location['y'])], matrix)[0].tolist()
+        updates["$.waypoint.location"] = {**location, 'x': x, 'y': y}
+        if not np.array_equal(matrix[:2, :2], np.eye(2)):
+            updates["$.waypoint.entry_direction"] = _transform_heading(get_path(data, "$.waypoint.entry_direction"), matrix)
+
+    if new_name is not None:
+        updates["$.header.name"] = new_name
+    return set_paths(data, updates, copy=True)
+
+
+def transform_map_folder(input_folder, output_folder, matrix):
+    """
+    一次变换整个地图文件夹：所有 .object 写入输出文件夹，
+    .map 的 last_modification 和 definition.json 的 time_stamp 更新为当前时间。
+
+    :return: 变换的对象名列表
+    """
+    now = int(time.time())
+    names = []
+    for filename in list_files(input_folder, ".object"):
+        data = transform_object(read_file(input_folder, filename), matrix)
+        write_file(output_folder, filename, data)
+        names.append(get_path(data, "$.header.name"))
+
+    for filename in list_files(input_folder, ".map"):
+        map_data = set_path(read_file(input_folder, filename), "$.last_modification", now, copy=True)
+        write_file(output_folder, filename, map_data)
+
+    site_data = set_path(read_file(input_folder, "definition.json"), "$.time_stamp", now, copy=True)
+    write_file(output_folder, "definition.json", site_data)
+
+    print(f"Transformed {len(names)} objects from {input_folder} to {output_folder}")
+    return names
+
+
+if __name__ == '__main__':
+    # 以(0, 0)为中心旋转90度后整体向x方向平移100米
+    transform_map_folder("map/template", "map/new", compose(rotation(90), translation(100, 0)))
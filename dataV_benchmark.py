@@ -0,0 +1,89 @@
+import argparse
+import csv
+import json
+import os
+import platform
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from insert_dataV_data import JsonlSink, MemorySink, ParquetSink, bulk_insert_csv
+
+
+def generate_csv(path, rows, vehicles=1, start=datetime(2024, 9, 22)):
+    """
+    生成与车辆导出格式相同的CSV：index, mac, created, value（value 为4段，首尾为时间戳）。
+    """
+    macs = [f"{0x876543210000 + i:012X}" for i in range(vehicles)]
+    with open(path, mode='w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["index", "mac", "created", "value"])
+        for i in range(rows):
+            created = start + timedelta(seconds=i // vehicles)
+            stamp = created.strftime("%Y%m%d%H%M%S")
+            writer.writerow([i % 64, macs[i % vehicles], created.strftime("%Y-%m-%d %H:%M:%S"),
+                             f"{stamp},{i % 1000},{(i * 7) % 256},{stamp}"])
+
+
+def _sinks(work_dir):
+    # 名称 -> 创建函数；未安装 pyarrow 时跳过 Parquet
+    sinks = {
+        "memory": lambda: MemorySink(keep=False),
+        "jsonl": lambda: JsonlSink(os.path.join(work_dir, "out.jsonl")),
+    }
+    try:
+        import pyarrow  # noqa: F401
+        sinks["parquet"] = lambda: ParquetSink(os.path.join(work_dir, "out.parquet"))
+    except ImportError:
+        print("未安装 pyarrow，跳过 parquet")
+    return sinks
+
+
+def run_benchmarks(rows, output_path, parsers=("csv", "pandas"), batch_size=5000, workers=4, work_dir=None):
+    """
+    在本地生成CSV，测量 解析+写入 的吞吐量，不需要网络和MongoDB。
+
+    :return: 报告字典，同时写入 output_path
+    """
+    results = []
+    root = tempfile.mkdtemp(prefix="dataV_benchmark_", dir=work_dir)
+    try:
+        csv_path = os.path.join(root, "vehicle.csv")
+        generate_csv(csv_path, rows)
+        print(f"已生成{rows}行CSV（{os.path.getsize(csv_path) / 1024 / 1024:.1f} MiB）")
+        sinks = _sinks(root)
+        for parser in parsers:
+            for sink_name, make_sink in sinks.items():
+                sink = make_sink()
+                try:
+                    stats = bulk_insert_csv(csv_path, day_offset=69, batch_size=batch_size, workers=workers,
+                                            target=sink, parser=parser)
+                finally:
+                    sink.close()
+                results.append({"parser": parser, "sink": sink_name, "rows": rows, "seconds": stats["seconds"],
+                                "docs_per_sec": stats["docs_per_sec"]})
+                print(f"{parser:<8} {sink_name:<8} {stats['seconds']:8.2f} s {stats['docs_per_sec']:12.0f} 条/秒")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "batch_size": batch_size,
+        "workers": workers,
+        "results": results,
+    }
+    with open(output_path, mode='w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="DataV CSV 解析与写入基准测试（离线）")
+    parser.add_argument("--rows", type=int, default=1000000, help="生成的CSV行数")
+    parser.add_argument("--parsers", nargs="+", default=["csv", "pandas"], choices=["csv", "pandas"])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--output", default="dataV_benchmark_result.json", help="结果JSON文件")
+    args = parser.parse_args()
+    run_benchmarks(args.rows, args.output, args.parsers, args.batch_size, args.workers)
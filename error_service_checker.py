@@ -6,12 +6,13 @@ import threading
 import uuid
 import json
 import math
-import pandas as pd
 from urllib import parse
 from collections import Counter
 from concurrent.futures import ThreadPoolExecutor
-from logger_config import get_logger, TextHandler
-from tkinter import filedialog, messagebox, scrolledtext
+from http_cassette import cassette_from_env
+from logger_config import attach_handler, get_logger, TextHandler
+from progress import format_duration, ProgressTracker, StatusReporter
+from tkinter import filedialog, messagebox, scrolledtext, ttk
 
 
 def get_token(domain, client_id, client_secret, scope="", logger=get_logger()):
@@ -26,6 +27,11 @@ def get_token(domain, client_id, client_secret, scope="", logger=get_logger()):
 
 
 BMS_sub_error_component = ('BMSWarnings', 'BMSErrors', 'BMSFatalErrors')
+# 抽样模式的分层键，每组抽取若干行
+SAMPLE_KEY_COLUMNS = ["product", "model number", "language", "datapoint_component"]
+# 快速失败模式下计入失败数的结果
+FAILURE_RESULTS = ('Failed', 'Error')
+NOT_CHECKED = 'Not checked'
 
 
 def normalize_newlines(text):
@@ -306,15 +312,25 @@ def check_error_descriptions(domain, access_token,
     return result
 
 
-def generate_rule_df(domain, token, df, logger=get_logger()):
+def generate_rule_df(domain, token, df, logger=get_logger(), progress=None):
+    """
+    :param progress: ProgressTracker，每检查完一条规则更新一次
+    """
+    import pandas as pd
+
     rule_df = df[df['is sub'] == 0]
     key_columns = ["product", "model number", "datapoint index", "component", "datapoint_component"]
     rule_df = rule_df[key_columns].drop_duplicates()
+    if progress:
+        progress.start_stage("Fault code rules", len(rule_df))
 
     # 多线程处理函数
     def process_row_with_closure(domain, token, key_columns, logger):  # 将额外参数封闭到函数内部，避免显式传递参数
         def inner(x):
-            return check_fault_code_rule(x, domain, token, key_columns, logger)
+            result = check_fault_code_rule(x, domain, token, key_columns, logger)
+            if progress:
+                progress.done(result["result"])
+            return result
 
         return inner
 
@@ -434,8 +450,48 @@ def get_BMS_sub_error_dict(df) -> dict:
     return result_dict
 
 
+def sample_rows(df, per_group, seed=0):
+    """
+    分层抽样：按 SAMPLE_KEY_COLUMNS 分组，每组随机取 per_group 行，另外保留全部BMS主行
+    （其子错误码在检查主行时一并检查）。返回按原顺序排列的行。
+    """
+    shuffled = df.sample(frac=1, random_state=seed)
+    sampled = shuffled.groupby(SAMPLE_KEY_COLUMNS, dropna=False, sort=False).head(per_group).index
+    bms_main = df[(df['datapoint_component'].isin(BMS_sub_error_component)) & (df['is sub'] == 0)].index
+    return df.loc[df.index.isin(sampled.union(bms_main))]
+
+
+def write_result_workbook(df, save_path, run_info):
+    """
+    保存结果；只检查了部分行时（抽样或快速失败）增加 Run info 工作表说明本次结果不完整。
+    """
+    import pandas as pd
+
+    if not run_info.get("partial"):
+        df.to_excel(save_path, index=False)
+        return
+    with pd.ExcelWriter(save_path) as writer:
+        df.to_excel(writer, sheet_name="Result", index=False)
+        pd.DataFrame(list(run_info.items()), columns=["item", "value"]).to_excel(writer, sheet_name="Run info",
+                                                                                 index=False)
+
+
 # 处理 Excel 文件函数
-def process_excel_files(domain, token, file_list, save_path, logger):
+def process_excel_files(domain, token, file_list, save_path, logger, progress=None, notify=True,
+                        sample_per_group=None, max_failures=None, sample_seed=0):
+    """
+    :param progress: ProgressTracker，每检查完一行或一条规则更新一次，供界面进度条或无界面运行器读取
+    :param notify: 完成或出错时弹出对话框，无界面运行时为 False
+    :param sample_per_group: 抽样模式，每个 (product, model number, language, datapoint_component) 只检查这么多行，
+                             BMS主行始终检查，结果只包含检查过的行
+    :param max_failures: 快速失败模式，Failed/Error 达到该数量后不再开始检查新行，未检查的行结果为 Not checked，
+                         也不再检查故障码规则
+    :param sample_seed: 抽样的随机种子，相同种子抽取相同的行
+    :return: 各结果的数量
+    """
+    # pandas（及其加载的 openpyxl）导入需要数秒，放到第一次处理时再导入，窗口可以立即显示
+    import pandas as pd
+
     try:
         # 读取表
         df = pd.DataFrame()
@@ -445,16 +501,38 @@ def process_excel_files(domain, token, file_list, save_path, logger):
                 _ = pd.read_excel(f, sheet_name=sheet_name)
                 df = pd.concat([df, _], ignore_index=True)
 
-        # 生成sub error dict
+        # 生成sub error dict（使用全部行，抽样后BMS主行仍能找到其子错误码）
         sub_error_dict = get_BMS_sub_error_dict(df)
+        total_rows = len(df)
+        if sample_per_group:
+            df = sample_rows(df, sample_per_group, sample_seed).reset_index(drop=True)
+            logger.info(f"Sampling mode: checking {len(df)} of {total_rows} rows")
+        if progress:
+            progress.start_stage("Error codes", len(df))
 
         # 逐行处理
         # df["result"] = df.apply(lambda x: check_error_return(domain, token, x['product'], x['model number'], x['component'], x['language'], x['error code'], x['fault code'], x['content'], x['suggestion'], logger=logger), axis=1)
 
         # 多线程处理函数
+        stopped = threading.Event()
+        failures = Counter()
+        failures_lock = threading.Lock()
+
         def process_row_with_closure(domain, token, sub_error_dict, logger):  # 将额外参数封闭到函数内部，避免显式传递参数
             def inner(x):
-                return check_error_return(x, domain, token, sub_error_dict, logger)
+                if stopped.is_set():
+                    result = {"result": NOT_CHECKED, "detail": f"Stopped after {max_failures} failures"}
+                else:
+                    result = check_error_return(x, domain, token, sub_error_dict, logger)
+                    if max_failures and result["result"] in FAILURE_RESULTS:
+                        with failures_lock:
+                            failures[result["result"]] += 1
+                            if sum(failures.values()) >= max_failures and not stopped.is_set():
+                                logger.warning(f"Fail-fast: {max_failures} failures reached, stop checking new rows")
+                                stopped.set()
+                if progress:
+                    progress.done(result["result"])
+                return result
 
             return inner
 
@@ -470,20 +548,44 @@ def process_excel_files(domain, token, file_list, save_path, logger):
                                                                                                             "error_codes_detail",
                                                                                                             "error_descriptions_detail"])
 
-        rule_df = generate_rule_df(domain, token, df, logger)
-        df = pd.concat([df, rule_df], ignore_index=True)
-
-        # 保存结果为 Excel 文件
-        df.to_excel(save_path, index=False)
+        if not stopped.is_set():
+            rule_df = generate_rule_df(domain, token, df, logger, progress)
+            df = pd.concat([df, rule_df], ignore_index=True)
 
         # 统计结果
         result_counts = dict(Counter(item["result"] for item in results))
-        messagebox.showinfo("Completed", f"Process completed, {result_counts}, result detail saved to: {save_path}")
+        checked_rows = len(results) - result_counts.get(NOT_CHECKED, 0)
+        run_info = {
+            "partial": bool(sample_per_group) or stopped.is_set(),
+            "mode": ", ".join(mode for mode, enabled in (("sampling", sample_per_group), ("fail-fast", max_failures))
+                              if enabled) or "full",
+            "source rows": total_rows,
+            "checked rows": checked_rows,
+            "sample per group": sample_per_group,
+            "sample seed": sample_seed if sample_per_group else None,
+            "max failures": max_failures,
+            "stopped early": stopped.is_set(),
+            "fault code rules checked": not stopped.is_set(),
+        }
+
+        # 保存结果为 Excel 文件
+        write_result_workbook(df, save_path, run_info)
+
+        partial = f" (partial: checked {checked_rows} of {total_rows} rows)" if run_info["partial"] else ""
+        logger.info(f"Process completed{partial}, {result_counts}, result detail saved to: {save_path}")
+        if notify:
+            messagebox.showinfo("Completed",
+                                f"Process completed{partial}, {result_counts}, result detail saved to: {save_path}")
+        return result_counts
 
     except Exception as e:
-        messagebox.showerror("错误", str(e))
+        if notify:
+            messagebox.showerror("错误", str(e))
         logger.error(e, exc_info=True)
         raise e
+    finally:
+        if progress:
+            progress.finish()
 
 
 def make_file_object(file_content):
@@ -544,6 +646,9 @@ def start_processing(my_app):
         client_secret = my_app.entry_client_secret.get()
         excel_file = my_app.entry_a.get()
         save_path = my_app.entry_save.get()
+        # 留空表示检查全部行
+        sample_per_group = int(my_app.entry_sample.get()) if my_app.entry_sample.get().strip() else None
+        max_failures = int(my_app.entry_max_failures.get()) if my_app.entry_max_failures.get().strip() else None
 
         if not (entry_guc_url and entry_es_url and client_id and client_secret and excel_file and save_path):
             messagebox.showerror("Error", "Please completed all fields.")
@@ -552,7 +657,8 @@ def start_processing(my_app):
         token = get_token(entry_guc_url, client_id, client_secret, scope='ErrorServiceApi', logger=my_app.logger)
         my_app.logger.info(token)
 
-        process_excel_files(entry_es_url, token, excel_file, save_path, my_app.logger)
+        process_excel_files(entry_es_url, token, excel_file, save_path, my_app.logger, my_app.progress,
+                            sample_per_group=sample_per_group, max_failures=max_failures)
     except Exception as e:
         my_app.logger.error(e)
         messagebox.showerror("Error", str(e))
@@ -560,16 +666,38 @@ def start_processing(my_app):
     return
 
 
+def run_headless(guc_url, es_url, client_id, client_secret, excel_file, save_path, status_interval=10,
+                 sample_per_group=None, max_failures=None, sample_seed=0):
+    """
+    不打开窗口直接运行检查，每 status_interval 秒输出一次进度。
+
+    :param excel_file: 多个文件用 | 分隔
+    :param sample_per_group: 见 process_excel_files
+    :param max_failures: 见 process_excel_files
+    """
+    logger = get_logger(queued=True)
+    logger.setLevel(logging.INFO)
+    progress = ProgressTracker()
+    token = get_token(guc_url, client_id, client_secret, scope='ErrorServiceApi', logger=logger)
+    with StatusReporter(progress, status_interval, logger.info):
+        return process_excel_files(es_url, token, excel_file, save_path, logger, progress, notify=False,
+                                   sample_per_group=sample_per_group, max_failures=max_failures,
+                                   sample_seed=sample_seed)
+
+
 class MyApp(tk.Tk):
     def __init__(self):
         super().__init__()
         self.log_handler = None
-        self.logger = get_logger()
+        # 日志经队列由单独线程输出，工作线程不会阻塞在控制台和Tk控件上
+        self.logger = get_logger(queued=True)
         self.logger.setLevel(logging.DEBUG)
         self.tasks = list()
+        self.progress = ProgressTracker()
 
         def async_call(func, *args, **kwargs):
             self.button_start.config(text="Running", state=tk.DISABLED)
+            self.progress = ProgressTracker()
             t = threading.Thread(target=func, args=args, kwargs=kwargs)
             self.tasks.append(t)
             t.daemon = True
@@ -583,10 +711,24 @@ class MyApp(tk.Tk):
                     self.button_start.config(text="Start Test", state=tk.NORMAL)
                 i += 1
 
+        def update_progress():
+            # 只读取计数器快照，不经过日志控件
+            snapshot = self.progress.snapshot()
+            self.progress_bar.config(maximum=max(snapshot["total"], 1), value=snapshot["completed"])
+            if not snapshot["stage"]:
+                return
+            counts = snapshot["counts"]
+            eta = "done" if snapshot["finished"] else format_duration(snapshot["eta_seconds"])
+            self.progress_label.config(
+                text=f'{snapshot["stage"]}: {snapshot["completed"]}/{snapshot["total"]}  '
+                     f'{snapshot["rows_per_sec"]:.1f} rows/s  ETA {eta}\n'
+                     f'Pass {counts.get("Pass", 0)}  Failed {counts.get("Failed", 0)}  Error {counts.get("Error", 0)}')
+
         def loop_update():
             check_task_status()
-            # 1 秒后再次调用自己
-            self.after(1000, loop_update)
+            update_progress()
+            # 0.5 秒后再次调用自己
+            self.after(500, loop_update)
 
         # 创建主窗口
         self.title("Error Service Checker")
@@ -666,9 +808,24 @@ class MyApp(tk.Tk):
         button_save.grid(row=i, column=2, padx=2, pady=2)
         i += 1
 
+        # 抽样和快速失败，留空表示检查全部行
+        self.entry_sample = create_label_entry(left_frame, name="Sample per group", width=10, row=i)
+        i += 1
+
+        self.entry_max_failures = create_label_entry(left_frame, name="Stop after failures", width=10, row=i)
+        i += 1
+
         # 开始处理按钮
         self.button_start = tk.Button(left_frame, text="Start Test", command=lambda: async_call(start_processing, self))
         self.button_start.grid(row=i, column=0, columnspan=3, pady=20)
+        i += 1
+
+        # 进度条和进度信息
+        self.progress_bar = ttk.Progressbar(left_frame, orient=tk.HORIZONTAL, mode='determinate')
+        self.progress_bar.grid(row=i, column=0, columnspan=3, padx=2, pady=2, sticky='ew')
+        i += 1
+        self.progress_label = tk.Label(left_frame, text="", justify=tk.LEFT)
+        self.progress_label.grid(row=i, column=0, columnspan=3, padx=2, pady=2, sticky='w')
 
         # 创建一个 ScrolledText 小部件用于显示日志
         i = 0
@@ -685,7 +842,7 @@ class MyApp(tk.Tk):
         i += 1
 
         # 创建自定义日志处理器
-        self.log_handler = TextHandler(self.log_widget)
+        self.log_handler = TextHandler(self.log_widget, poll_interval=100)
 
         # 设置日志格式
         formatter = logging.Formatter('%(asctime)s - %(levelname)s: %(message)s')
@@ -693,7 +850,7 @@ class MyApp(tk.Tk):
 
         # 获取根日志记录器并添加处理器
         self.logger.setLevel(logging.INFO)
-        self.logger.addHandler(self.log_handler)
+        attach_handler(self.logger, self.log_handler)
 
         def clear():
             self.log_widget.configure(state='normal')
@@ -708,6 +865,30 @@ class MyApp(tk.Tk):
 
 
 if __name__ == "__main__":
-    pass
-    app = MyApp()
-    app.mainloop()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Error Service Checker，不带 --headless 时打开窗口")
+    parser.add_argument("--headless", action="store_true", help="不打开窗口，定时输出进度")
+    parser.add_argument("--guc-url", default="https://dev6-guc.globetools.com")
+    parser.add_argument("--es-url")
+    parser.add_argument("--client-id", default="A3SService")
+    parser.add_argument("--client-secret")
+    parser.add_argument("--excel", help="多个文件用 | 分隔")
+    parser.add_argument("--save")
+    parser.add_argument("--status-interval", type=float, default=10, help="进度输出间隔（秒）")
+    parser.add_argument("--sample-per-group", type=int, help="抽样模式：每个 product/model/language/component 检查的行数")
+    parser.add_argument("--sample-seed", type=int, default=0)
+    parser.add_argument("--max-failures", type=int, help="快速失败模式：失败数达到该值后停止检查新行")
+    args = parser.parse_args()
+
+    # 设置环境变量 HTTP_CASSETTE 可录制或离线回放HTTP请求，见 http_cassette.cassette_from_env
+    if args.headless:
+        if not (args.es_url and args.client_secret and args.excel and args.save):
+            parser.error("--headless 需要 --es-url、--client-secret、--excel 和 --save")
+        with cassette_from_env():
+            run_headless(args.guc_url, args.es_url, args.client_id, args.client_secret, args.excel, args.save,
+                         args.status_interval, args.sample_per_group, args.max_failures, args.sample_seed)
+    else:
+        app = MyApp()
+        with cassette_from_env():
+            app.mainloop()
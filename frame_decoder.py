@@ -0,0 +1,150 @@
+import re
+import numpy as np
+from utils import little_endian_to_decimal
+
+# 字段格式：字节序 < 小端 / > 大端，u 无符号 / i 有符号，字节数 1~8，如 "<u2"、">i4"、"<u3"
+FORMAT_PATTERN = re.compile(r"^([<>])([ui])([1-8])$")
+
+
+def parse_format(fmt):
+    match = FORMAT_PATTERN.match(fmt)
+    if match is None:
+        raise ValueError(f"不支持的字段格式: {fmt}")
+    byteorder, kind, size = match.groups()
+    return byteorder, kind == "i", int(size)
+
+
+class FrameLayout:
+    """
+    固定长度数据帧的字段布局。
+
+    fields 为 [(名称, 格式), ...] 或 [(名称, 格式, 偏移), ...]；不给偏移时字段依次紧挨排列。
+    frame_size 默认为最后一个字段的结束位置，帧中多余的字节会被忽略。
+    """
+
+    def __init__(self, fields, frame_size=None):
+        self.fields = []
+        offset = 0
+        for field in fields:
+            name, fmt = field[0], field[1]
+            if len(field) > 2:
+                offset = field[2]
+            byteorder, signed, size = parse_format(fmt)
+            self.fields.append((name, offset, byteorder, signed, size))
+            offset += size
+        end = max(offset + size for _, offset, _, _, size in self.fields)
+        self.frame_size = frame_size or end
+        if self.frame_size < end:
+            raise ValueError(f"帧长度{self.frame_size}小于字段结束位置{end}")
+
+    def __repr__(self):
+        return f"FrameLayout({[(name, offset, byteorder, signed, size) for name, offset, byteorder, signed, size in self.fields]}, frame_size={self.frame_size})"
+
+
+def hex_to_frames(hex_strings, frame_size=None):
+    """
+    把多个十六进制字符串（可含空格，如 '4e bb 02 0e'）转换为 (n, frame_size) 的 uint8 数组。
+    """
+    cleaned = [hex_str.replace(' ', '') for hex_str in hex_strings]
+    lengths = set(map(len, cleaned))
+    if frame_size is None:
+        if len(lengths) > 1:
+            raise ValueError(f"帧长度不一致: {sorted(lengths)}")
+        frame_size = lengths.pop() // 2 if lengths else 0
+    elif lengths - {frame_size * 2}:
+        raise ValueError(f"帧长度应为{frame_size}字节，实际为 {sorted(length / 2 for length in lengths)}")
+    data = bytes.fromhex(''.join(cleaned))
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(cleaned), frame_size)
+
+
+def to_frames(frames, frame_size):
+    """
+    :param frames: 连续的 bytes/bytearray/memoryview、bytes 列表、十六进制字符串列表或 (n, frame_size) uint8 数组
+    """
+    if isinstance(frames, np.ndarray):
+        frames = np.ascontiguousarray(frames, dtype=np.uint8)
+        return frames.reshape(-1, frames.shape[-1] if frames.ndim > 1 else frame_size)
+    if isinstance(frames, (bytes, bytearray, memoryview)):
+        data = np.frombuffer(frames, dtype=np.uint8)
+        if data.size % frame_size:
+            raise ValueError(f"数据长度{data.size}不是帧长度{frame_size}的整数倍")
+        return data.reshape(-1, frame_size)
+    frames = list(frames)
+    if frames and isinstance(frames[0], str):
+        return hex_to_frames(frames, frame_size)
+    return to_frames(b''.join(frames), frame_size)
+
+
+def decode_field(frames, offset, byteorder="<", signed=False, size=4):
+    """
+    从 (n, frame_size) uint8 数组中解码一个定长整数字段，返回 int64/uint64 数组。
+    """
+    columns = frames[:, offset:offset + size]
+    if size in (1, 2, 4, 8):
+        # 标准宽度：直接把字节重新解释为对应的整数类型
+        dtype = np.dtype(f"{byteorder}{'i' if signed else 'u'}{size}")
+        values = np.ascontiguousarray(columns).view(dtype).reshape(-1)
+        return values.astype(np.int64 if signed or size < 8 else np.uint64)
+    # 3/5/6/7 字节：按字节加权求和
+    if byteorder == ">":
+        columns = columns[:, ::-1]
+    values = np.zeros(len(frames), dtype=np.int64)
+    for i in range(size):
+        values |= columns[:, i].astype(np.int64) << (8 * i)
+    if signed:
+        sign_bit = 1 << (8 * size - 1)
+        values = np.where(values & sign_bit, values - (sign_bit << 1), values)
+    return values
+
+
+def decode_frames(frames, layout):
+    """
+    按布局批量解码多个数据帧。
+
+    :param frames: 见 to_frames
+    :param layout: FrameLayout 或 FrameLayout 接受的字段列表
+    :return: {字段名: numpy数组}
+    """
+    if not isinstance(layout, FrameLayout):
+        layout = FrameLayout(layout)
+    frames = to_frames(frames, layout.frame_size)
+    if frames.shape[1] < layout.frame_size:
+        raise ValueError(f"帧长度{frames.shape[1]}小于布局要求的{layout.frame_size}")
+    return {name: decode_field(frames, offset, byteorder, signed, size)
+            for name, offset, byteorder, signed, size in layout.fields}
+
+
+def decode_values(hex_strings, byteorder="little", signed=False):
+    """
+    批量版的 utils.little_endian_to_decimal：每个字符串是一个定长整数。
+
+    1~8 字节返回 numpy 数组；更宽的值逐个解码为 Python int 列表。
+    """
+    hex_strings = list(hex_strings)
+    if not hex_strings:
+        return np.zeros(0, dtype=np.int64)
+    frames = hex_to_frames(hex_strings)
+    size = frames.shape[1]
+    if size <= 8:
+        return decode_field(frames, 0, "<" if byteorder == "little" else ">", signed, size)
+    if byteorder == "little" and not signed:
+        return [little_endian_to_decimal(hex_str) for hex_str in hex_strings]
+    return [int.from_bytes(frame.tobytes(), byteorder, signed=signed) for frame in frames]
+
+
+def decode_column(values, layout, part=None, sep=','):
+    """
+    解码一列文本中的数据帧，例如 DataV CSV 的 val 列。
+
+    :param part: val 按 sep 分割后取第几段作为帧，None 表示整个值就是帧
+    """
+    if part is not None:
+        values = [value.split(sep)[part] for value in values]
+    return decode_frames(values, layout)
+
+
+if __name__ == '__main__':
+    # 与 utils.little_endian_to_decimal('4e bb 02 0e') 结果相同
+    print(decode_values(['4e bb 02 0e', '01 00 00 00']))
+    layout = FrameLayout([("voltage", "<u2"), ("current", "<i2"), ("counter", ">u3"), ("flags", "<u1")])
+    print(decode_frames(['e8 03 18 fc 00 01 00 05'], layout))
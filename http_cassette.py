@@ -0,0 +1,219 @@
+import base64
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from urllib import parse
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# 录制时替换为 REDACTED 的请求头和字段（JSON、表单和URL参数中的同名字段，不区分大小写）
+REDACT_HEADERS = ("authorization", "access-token", "cookie", "set-cookie", "proxy-authorization")
+REDACT_FIELDS = ("password", "client_secret", "access_token", "refresh_token", "token", "secret")
+REDACTED = "REDACTED"
+
+
+class CassetteMiss(requests.ConnectionError):
+    # 回放时找不到匹配的录制记录
+    pass
+
+
+def _redact_value(value, fields):
+    if isinstance(value, dict):
+        return {key: REDACTED if key.lower() in fields else _redact_value(item, fields) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_redact_value(item, fields) for item in value]
+    return value
+
+
+def redact_text(text, fields=REDACT_FIELDS):
+    """
+    脱敏JSON或 application/x-www-form-urlencoded 文本中的敏感字段，其他文本原样返回。
+    """
+    if not text:
+        return text
+    try:
+        return json.dumps(_redact_value(json.loads(text), fields), ensure_ascii=False)
+    except ValueError:
+        pass
+    if "=" in text and " " not in text and "\n" not in text:
+        pairs = parse.parse_qsl(text, keep_blank_values=True)
+        if pairs and any(key.lower() in fields for key, _ in pairs):
+            return parse.urlencode([(key, REDACTED if key.lower() in fields else value) for key, value in pairs])
+    return text
+
+
+def redact_url(url, fields=REDACT_FIELDS):
+    parts = parse.urlsplit(url)
+    if not parts.query:
+        return url
+    return parse.urlunsplit(parts._replace(query=redact_text(parts.query, fields)))
+
+
+def redact_headers(headers, names=REDACT_HEADERS):
+    return {key: REDACTED if key.lower() in names else value for key, value in headers.items()}
+
+
+def _body_text(body):
+    # 请求体可能是 str、bytes 或 None（multipart上传为bytes）
+    if body is None:
+        return ""
+    if isinstance(body, bytes):
+        return body.decode("utf-8", errors="replace")
+    return str(body)
+
+
+def _encode_content(content):
+    try:
+        return content.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        return base64.b64encode(content).decode("ascii"), "base64"
+
+
+def _decode_content(text, encoding):
+    return base64.b64decode(text) if encoding == "base64" else text.encode("utf-8")
+
+
+class Cassette:
+    """
+    HTTP请求/响应录制文件（JSON）。录制时脱敏敏感字段；回放时先按 方法+URL+请求体 匹配，
+    请求体每次不同（如带时间戳的注册数据、multipart边界）时再按 方法+URL 依次取用。
+    """
+
+    def __init__(self, path, redact_fields=REDACT_FIELDS, redact_header_names=REDACT_HEADERS):
+        self.path = path
+        self.redact_fields = tuple(field.lower() for field in redact_fields)
+        self.redact_header_names = tuple(name.lower() for name in redact_header_names)
+        self.entries = []
+        self.lock = threading.Lock()
+        self._by_body = None
+        self._by_url = None
+
+    def load(self):
+        with open(self.path, mode='r', encoding='utf-8') as file:
+            self.entries = json.load(file)["interactions"]
+        self._by_body = collections.defaultdict(collections.deque)
+        self._by_url = collections.defaultdict(collections.deque)
+        for entry in self.entries:
+            request = entry["request"]
+            self._by_body[(request["method"], request["url"], request["body"])].append(entry)
+            self._by_url[(request["method"], request["url"])].append(entry)
+        return self
+
+    def save(self):
+        data = {"recorded": datetime.now().isoformat(timespec="seconds"), "interactions": self.entries}
+        temp_path = os.path.join(os.path.dirname(os.path.abspath(self.path)),
+                                 f".{os.path.basename(self.path)}.{uuid.uuid4().hex}.tmp")
+        with open(temp_path, mode='w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.path)
+
+    def _request_key(self, prepared_request):
+        return (prepared_request.method, redact_url(prepared_request.url, self.redact_fields),
+                redact_text(_body_text(prepared_request.body), self.redact_fields))
+
+    def record(self, prepared_request, response, elapsed):
+        """
+        :param elapsed: 请求耗时（秒）；adapter 返回时 response.elapsed 尚未由 Session 设置
+        """
+        method, url, body = self._request_key(prepared_request)
+        content, encoding = _encode_content(response.content)
+        if encoding == "utf-8":
+            content = redact_text(content, self.redact_fields)
+        entry = {
+            "request": {
+                "method": method,
+                "url": url,
+                "headers": redact_headers(prepared_request.headers, self.redact_header_names),
+                "body": body,
+            },
+            "response": {
+                "status_code": response.status_code,
+                "reason": response.reason,
+                "headers": redact_headers(response.headers, self.redact_header_names),
+                "content": content,
+                "content_encoding": encoding,
+                "elapsed": elapsed,
+            },
+        }
+        with self.lock:
+            self.entries.append(entry)
+
+    def find(self, prepared_request):
+        method, url, body = self._request_key(prepared_request)
+        with self.lock:
+            for queue_, key in ((self._by_body, (method, url, body)), (self._by_url, (method, url))):
+                entries = queue_.get(key)
+                while entries:
+                    entry = entries.popleft()
+                    if not entry.get("_used"):
+                        entry["_used"] = True
+                        return entry
+        raise CassetteMiss(f"录制文件 {self.path} 中没有匹配的请求: {method} {url}")
+
+
+def build_response(entry, prepared_request):
+    recorded = entry["response"]
+    response = requests.Response()
+    response.status_code = recorded["status_code"]
+    response.reason = recorded["reason"]
+    response.headers = CaseInsensitiveDict(recorded["headers"])
+    response._content = _decode_content(recorded["content"], recorded["content_encoding"])
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.url = prepared_request.url
+    response.request = prepared_request
+    return response
+
+
+@contextlib.contextmanager
+def use_cassette(path, mode="replay", latency_scale=1.0):
+    """
+    在 with 块内录制或回放所有通过 requests 发出的HTTP请求（替换 HTTPAdapter.send）。
+
+    :param mode: "record" 发送真实请求并在退出时保存到 path；"replay" 从 path 返回录制的响应，不访问网络
+    :param latency_scale: 回放时按录制耗时乘以该系数等待，1 为原始延迟，0 为不等待
+    """
+    if mode not in ("record", "replay"):
+        raise ValueError(f"不支持的模式: {mode}")
+    cassette = Cassette(path)
+    original_send = HTTPAdapter.send
+
+    if mode == "record":
+        def send(adapter, request, **kwargs):
+            start = time.perf_counter()
+            response = original_send(adapter, request, **kwargs)
+            cassette.record(request, response, time.perf_counter() - start)
+            return response
+    else:
+        cassette.load()
+
+        def send(adapter, request, **kwargs):
+            entry = cassette.find(request)
+            if latency_scale:
+                time.sleep(entry["response"]["elapsed"] * latency_scale)
+            return build_response(entry, request)
+
+    HTTPAdapter.send = send
+    try:
+        yield cassette
+    finally:
+        HTTPAdapter.send = original_send
+        if mode == "record":
+            cassette.save()
+
+
+def cassette_from_env():
+    """
+    根据环境变量 HTTP_CASSETTE（文件路径）、HTTP_CASSETTE_MODE（record/replay，默认replay）、
+    HTTP_CASSETTE_LATENCY（回放延迟系数，默认1）启用录制/回放，未设置时不做任何处理。
+    """
+    path = os.environ.get("HTTP_CASSETTE")
+    if not path:
+        return contextlib.nullcontext()
+    return use_cassette(path, os.environ.get("HTTP_CASSETTE_MODE", "replay"),
+                        float(os.environ.get("HTTP_CASSETTE_LATENCY", "1")))
@@ -1,60 +1,1188 @@
 import csv
+import glob
+import heapq
+import io
+import json
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from pymongo import MongoClient
 
 
-# 配置MongoDB连接
-client = MongoClient("mongodb://52.82.80.187:27017/")
-db = client["DataV"]
-collection = db["vehicle_data"]
+# 配置MongoDB连接（首次写入时才连接，可用环境变量 DATAV_MONGO_URI 覆盖）
+DEFAULT_URI = os.environ.get("DATAV_MONGO_URI", "mongodb://52.82.80.187:27017/")
+DEFAULT_DATABASE = "DataV"
+DEFAULT_COLLECTION = "vehicle_data"
 
 
-def process_csv_and_update_db(csv_file_path, mac=None, day_offset=0, batch_size=1000):
+def make_document(row, mac=None, day_offset=0):
+    # 获取并修改数据
+    created_time = datetime.strptime(row['created'], "%Y-%m-%d %H:%M:%S")
+    new_created_time = created_time + timedelta(days=day_offset)
+
+    value_parts = row['value'].split(',')
+    if len(value_parts) == 4:
+        value_parts[0] = new_created_time.strftime("%Y%m%d%H%M%S")
+        value_parts[3] = new_created_time.strftime("%Y%m%d%H%M%S")
+
+    new_value = ','.join(value_parts)
+
+    # 构造要插入的文档
+    return {
+        "timestamp": new_created_time,
+        "metadata": {
+            "index": int(row['index']),
+            "mac": mac if mac else row['mac']
+        },
+        "val": new_value
+    }
+
+
+def iter_documents_csv(csv_file_path, mac=None, day_offset=0, start_offset=0):
+    """
+    逐行解析，产生 (文档, 该行结束处的字节偏移)。
+
+    :param start_offset: 从该字节偏移继续读取（须为行首，通常来自检查点），0表示从表头之后开始
+    """
+    with open(csv_file_path, mode='rb') as file:
+        fieldnames = next(csv.reader([file.readline().decode('utf-8')]))
+        if start_offset:
+            file.seek(start_offset)
+        position = file.tell()
+
+        def lines():
+            # csv.reader 按需取行，取完一行记录时 position 正好是该记录的结束位置
+            nonlocal position
+            for line in file:
+                position += len(line)
+                yield line.decode('utf-8')
+
+        for row in csv.DictReader(lines(), fieldnames=fieldnames):
+            yield make_document(row, mac, day_offset), position
+
+
+# 恰好4段的 value：第1段和第4段为时间戳，中间两段保持不变
+VALUE_PATTERN = r"^[^,]*,([^,]*,[^,]*),[^,]*$"
+
+
+def make_documents_frame(chunk, mac=None, day_offset=0):
+    """
+    按列处理一个 DataFrame 分块，结果与逐行调用 make_document 相同。
+    """
+    import pandas as pd
+
+    created = pd.to_datetime(chunk['created'], format="%Y-%m-%d %H:%M:%S") + pd.Timedelta(days=day_offset)
+    # 等价于 strftime("%Y%m%d%H%M%S")，用整数运算拼接比逐个格式化快得多
+    parts = created.dt
+    stamp = (parts.year.astype("int64") * 10000000000 + parts.month.astype("int64") * 100000000
+             + parts.day.astype("int64") * 1000000 + parts.hour.astype("int64") * 10000
+             + parts.minute.astype("int64") * 100 + parts.second.astype("int64")).astype(str)
+    middle = chunk['value'].str.extract(VALUE_PATTERN, expand=False)
+    values = (stamp + "," + middle + "," + stamp).where(middle.notna(), chunk['value'])
+    indexes = chunk['index'].astype("int64")
+    macs = [mac] * len(chunk) if mac else chunk['mac'].tolist()
+    return [
+        {"timestamp": timestamp, "metadata": {"index": index, "mac": mac_value}, "val": val}
+        for timestamp, index, mac_value, val in zip(
+            list(created.dt.to_pydatetime()), indexes.tolist(), macs, values.tolist())
+    ]
+
+
+def iter_documents_pandas(csv_file_path, mac=None, day_offset=0, start_offset=0, chunk_size=100000):
+    """
+    按块向量化解析，产生 (文档, 该行结束处的字节偏移)。
+
+    按行切分原始字节后交给 pandas，以便记录每行的偏移；不支持字段内换行。
+    """
+    import pandas as pd
+
+    with open(csv_file_path, mode='rb') as file:
+        fieldnames = next(csv.reader([file.readline().decode('utf-8')]))
+        if start_offset:
+            file.seek(start_offset)
+        position = file.tell()
+        while True:
+            lines = file.readlines(chunk_size * 64) if chunk_size else file.readlines()
+            if not lines:
+                break
+            offsets = []
+            rows = []
+            for line in lines:
+                position += len(line)
+                if line.strip():  # 与 csv.DictReader 一样跳过空行
+                    rows.append(line)
+                    offsets.append(position)
+            if not rows:
+                continue
+            # 全部按字符串读取，避免类型推断改变 value/mac 的内容
+            chunk = pd.read_csv(io.BytesIO(b"".join(rows)), names=fieldnames, header=None, dtype=str,
+                                keep_default_na=False, encoding='utf-8')
+            yield from zip(make_documents_frame(chunk, mac, day_offset), offsets)
+
+
+PARSERS = {"csv": iter_documents_csv, "pandas": iter_documents_pandas}
+
+
+def iter_document_batches(csv_file_path, mac=None, day_offset=0, batch_size=1000, parser="csv", start_offset=0):
+    """
+    产生 (文档列表, 批次结束处的字节偏移)。
+
+    :param parser: "csv" 逐行解析；"pandas" 按块向量化解析，适合百万行以上的导出文件
+    """
+    if parser not in PARSERS:
+        raise ValueError(f"不支持的解析器: {parser}")
+    documents = []
+    offset = start_offset
+    for document, offset in PARSERS[parser](csv_file_path, mac, day_offset, start_offset):
+        documents.append(document)
+        if len(documents) >= batch_size:
+            yield documents, offset
+            documents = []
+    if documents:
+        yield documents, offset
+
+
+def make_write_concern(write_concern):
+    # 支持 WriteConcern、{"w": 1, "j": False} 或直接给出 w（如 0、1、"majority"）
+    if write_concern is None:
+        return None
+    from pymongo.write_concern import WriteConcern
+
+    if isinstance(write_concern, WriteConcern):
+        return write_concern
+    if isinstance(write_concern, dict):
+        return WriteConcern(**write_concern)
+    return WriteConcern(w=write_concern)
+
+
+# 一条车辆数据的唯一键
+KEY_INDEX = [("metadata.mac", 1), ("metadata.index", 1), ("timestamp", 1)]
+DUPLICATE_KEY_ERROR = 11000
+MODES = ("insert", "upsert", "dedupe")
+
+
+def document_key(document):
+    return {
+        "metadata.mac": document["metadata"]["mac"],
+        "metadata.index": document["metadata"]["index"],
+        "timestamp": document["timestamp"],
+    }
+
+
+def is_timeseries(target):
+    info = next(target.database.list_collections(filter={"name": target.name}), None)
+    return info is not None and "timeseries" in info.get("options", {})
+
+
+def ensure_unique_key(target):
+    # "dedupe" 模式依赖的唯一索引；时间序列集合不支持唯一索引，在建索引前给出明确的错误
+    if is_timeseries(target):
+        raise ValueError(f"{target.database.name}.{target.name} 是时间序列集合，不支持唯一索引，"
+                         f"请使用 mode=\"upsert\" 代替 \"dedupe\"")
+    target.create_index(KEY_INDEX, unique=True, name="vehicle_key")
+
+
+def ensure_key_index(target, mode):
+    """
+    "upsert" 模式按 (mac, index, timestamp) 逐条匹配，导入前必须有该键的索引，否则每次匹配都要扫描整个集合。
+
+    普通集合建唯一索引，并发写入同一车辆的数据也不会产生重复；时间序列集合不支持唯一索引，建普通索引。
+    与 defer_indexes 无关，导入前总会建好。
+    """
+    if mode != "upsert" or not is_mongo(target):
+        return
+    target = as_collection(target)
+    if not is_timeseries(target):
+        target.create_index(KEY_INDEX, unique=True, name="vehicle_key")
+    elif KEY_INDEX not in [list(index["key"]) for index in target.index_information().values()]:
+        # 与看板索引 mac_index_timestamp 的键相同，之后 ensure_indexes 会跳过
+        target.create_index(KEY_INDEX, name="mac_index_timestamp")
+
+
+def check_dedupe_target(target, mode, provision=False):
+    # 导入开始前检查 "dedupe" 模式的目标并建唯一索引；provision 会创建时间序列集合，与 "dedupe" 不兼容
+    if mode != "dedupe" or not is_mongo(target):
+        return
+    if provision:
+        raise ValueError("provision 创建的时间序列集合不支持唯一索引，\"dedupe\" 模式请改用 mode=\"upsert\"")
+    ensure_unique_key(as_collection(target))
+
+
+def write_documents(target, documents, mode="insert", ordered=False):
+    """
+    写入一批文档，返回其中新写入的文档（重复而被跳过的不包括在内）。
+
+    :param mode: "insert" 直接插入；"upsert" 按 (mac, index, timestamp) 批量 $setOnInsert，重复运行不产生重复数据；
+                 "dedupe" 无序插入，忽略唯一索引上的重复键错误
+    """
+    from pymongo import UpdateOne
+    from pymongo.errors import BulkWriteError
+
+    if mode == "insert":
+        target.insert_many(documents, ordered=ordered)
+        return documents
+    if mode == "upsert":
+        requests = [UpdateOne(document_key(document), {"$setOnInsert": document}, upsert=True) for document in documents]
+        result = target.bulk_write(requests, ordered=False)
+        if not result.acknowledged:
+            return documents
+        return [documents[i] for i in sorted(result.upserted_ids)]
+    if mode == "dedupe":
+        try:
+            target.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            if any(error["code"] != DUPLICATE_KEY_ERROR for error in e.details["writeErrors"]):
+                raise
+            duplicates = {error["index"] for error in e.details["writeErrors"]}
+            return [document for i, document in enumerate(documents) if i not in duplicates]
+        return documents
+    raise ValueError(f"不支持的写入模式: {mode}")
+
+
+class MongoSink:
+    """
+    写入MongoDB集合。客户端在第一次访问 collection 时才创建，导入模块不会连接服务器。
+    """
+
+    def __init__(self, uri=DEFAULT_URI, database=DEFAULT_DATABASE, collection=DEFAULT_COLLECTION, max_pool_size=100,
+                 write_concern=None, ordered=False):
+        self.uri = uri
+        self.database_name = database
+        self.collection_name = collection
+        self.max_pool_size = max_pool_size
+        self.write_concern = make_write_concern(write_concern)
+        self.ordered = ordered
+        self.client = None
+        self._collection = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_collection(cls, collection, write_concern=None):
+        # 包装已有的 pymongo 集合（客户端由调用方管理）
+        write_concern = make_write_concern(write_concern)
+        sink = cls(database=collection.database.name, collection=collection.name)
+        sink._collection = collection.with_options(write_concern=write_concern) if write_concern else collection
+        return sink
+
+    @property
+    def collection(self):
+        with self.lock:
+            if self._collection is None:
+                from pymongo import MongoClient
+
+                self.client = MongoClient(self.uri, maxPoolSize=self.max_pool_size)
+                collection = self.client[self.database_name][self.collection_name]
+                if self.write_concern:
+                    collection = collection.with_options(write_concern=self.write_concern)
+                self._collection = collection
+            return self._collection
+
+    def write(self, documents, mode="insert"):
+        return write_documents(self.collection, documents, mode, self.ordered)
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+            self._collection = None
+
+
+class MemorySink:
+    """
+    写入内存列表，用于测试和不依赖网络的基准测试；keep=False 时只计数不保存文档。
+    """
+
+    def __init__(self, keep=True):
+        self.keep = keep
+        self.documents = []
+        self.count = 0
+        self.keys = set()
+        self.lock = threading.Lock()
+
+    def write(self, documents, mode="insert"):
+        if mode not in MODES:
+            raise ValueError(f"不支持的写入模式: {mode}")
+        with self.lock:
+            if mode != "insert":
+                # "upsert"/"dedupe" 在内存中按唯一键去重
+                new_documents = []
+                for document in documents:
+                    key = tuple(document_key(document).values())
+                    if key not in self.keys:
+                        self.keys.add(key)
+                        new_documents.append(document)
+                documents = new_documents
+            self.count += len(documents)
+            if self.keep:
+                self.documents.extend(documents)
+        return documents
+
+    def close(self):
+        pass
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"无法序列化为JSON: {type(value).__name__}")
+
+
+class JsonlSink:
+    """
+    每个文档写为一行JSON（timestamp 为ISO格式字符串），只支持 "insert" 模式。
+    """
+
+    def __init__(self, path, append=False):
+        self.path = path
+        self.file = open(path, mode='a' if append else 'w', encoding='utf-8')
+        self.lock = threading.Lock()
+
+    def write(self, documents, mode="insert"):
+        if mode != "insert":
+            raise ValueError(f"{type(self).__name__} 不支持写入模式: {mode}")
+        text = "".join(json.dumps(document, ensure_ascii=False, default=_json_default) + "\n" for document in documents)
+        with self.lock:
+            self.file.write(text)
+        return documents
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetSink:
+    """
+    每个批次写为Parquet文件的一个行组，需要安装 pyarrow，只支持 "insert" 模式。
+    """
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("ParquetSink 需要安装 pyarrow: pip install pyarrow") from e
+        self.pa = pa
+        self.path = path
+        self.schema = pa.schema([
+            ("timestamp", pa.timestamp("us")),
+            ("metadata", pa.struct([("index", pa.int64()), ("mac", pa.string())])),
+            ("val", pa.string()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.lock = threading.Lock()
+
+    def write(self, documents, mode="insert"):
+        if mode != "insert":
+            raise ValueError(f"{type(self).__name__} 不支持写入模式: {mode}")
+        table = self.pa.Table.from_pylist(documents, schema=self.schema)
+        with self.lock:
+            self.writer.write_table(table)
+        return documents
+
+    def close(self):
+        self.writer.close()
+
+
+_default_sink = None
+_default_sink_lock = threading.Lock()
+
+
+def default_sink():
+    # 默认写入 DataV.vehicle_data，整个进程共用一个连接池
+    global _default_sink
+    with _default_sink_lock:
+        if _default_sink is None:
+            _default_sink = MongoSink()
+        return _default_sink
+
+
+def is_collection(target):
+    # 没有导入过 pymongo 时 target 不可能是 pymongo 集合，不必为了判断类型而导入
+    if "pymongo.collection" not in sys.modules:
+        return False
+    from pymongo.collection import Collection
+
+    return isinstance(target, Collection)
+
+
+def is_mongo(target):
+    return isinstance(target, MongoSink) or is_collection(target)
+
+
+def as_sink(target=None, write_concern=None):
+    """
+    :param target: None（默认MongoDB集合）、pymongo Collection 或任何带 write(documents, mode) 方法
+                   （返回新写入的文档）的sink
+    """
+    if target is None:
+        target = default_sink()
+    if is_collection(target):
+        return MongoSink.from_collection(target, write_concern)
+    if write_concern is not None and isinstance(target, MongoSink):
+        return MongoSink.from_collection(target.collection, write_concern)
+    return target
+
+
+def as_collection(target=None):
+    # 集合管理（建集合、建索引、存储统计）只适用于MongoDB
+    if target is None:
+        target = default_sink()
+    if isinstance(target, MongoSink):
+        return target.collection
+    if is_collection(target):
+        return target
+    raise TypeError(f"{type(target).__name__} 不是MongoDB集合")
+
+
+# 时间序列集合的布局与看板查询使用的二级索引
+TIME_FIELD = "timestamp"
+META_FIELD = "metadata"
+GRANULARITIES = ("seconds", "minutes", "hours")
+DASHBOARD_INDEXES = {
+    "mac_timestamp": [("metadata.mac", 1), ("timestamp", 1)],
+    "mac_index_timestamp": [("metadata.mac", 1), ("metadata.index", 1), ("timestamp", 1)],
+}
+
+
+def ensure_collection(target=None, granularity="seconds", create_indexes=True):
+    """
+    创建或校验时间序列集合（timeField=timestamp, metaField=metadata）。
+
+    已存在的普通集合或字段不一致的时间序列集合会抛出 ValueError；
+    粒度只能调大（collMod），比现有粒度更细时仅提示。
+
+    :param granularity: "seconds"、"minutes" 或 "hours"，按单车上报间隔选择
+    :param create_indexes: False 时推迟建索引，大批量导入完成后再调用 ensure_indexes
+    """
+    target = as_collection(target)
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"不支持的粒度: {granularity}")
+    database = target.database
+    info = next(database.list_collections(filter={"name": target.name}), None)
+    if info is None:
+        database.create_collection(target.name, timeseries={
+            "timeField": TIME_FIELD, "metaField": META_FIELD, "granularity": granularity})
+        print(f"已创建时间序列集合 {database.name}.{target.name}（粒度 {granularity}）")
+    else:
+        options = info.get("options", {}).get("timeseries")
+        if options is None:
+            raise ValueError(f"{database.name}.{target.name} 已存在但不是时间序列集合")
+        if options.get("timeField") != TIME_FIELD or options.get("metaField") != META_FIELD:
+            raise ValueError(f"{database.name}.{target.name} 的 timeField/metaField 为 "
+                             f"{options.get('timeField')}/{options.get('metaField')}，应为 {TIME_FIELD}/{META_FIELD}")
+        current = options.get("granularity")
+        if current in GRANULARITIES and GRANULARITIES.index(current) < GRANULARITIES.index(granularity):
+            database.command("collMod", target.name, timeseries={"granularity": granularity})
+            print(f"已将 {database.name}.{target.name} 的粒度从 {current} 调整为 {granularity}")
+        elif current != granularity:
+            print(f"{database.name}.{target.name} 的粒度为 {current}，无法改为更细的 {granularity}")
+    if create_indexes:
+        ensure_indexes(target)
+    return target
+
+
+def ensure_indexes(target=None):
+    """
+    创建看板查询需要的二级索引，已有相同键的索引时跳过。
+
+    :return: 新建的索引名列表
+    """
+    target = as_collection(target)
+    existing = [list(index["key"]) for index in target.index_information().values()]
+    created = []
+    for name, keys in DASHBOARD_INDEXES.items():
+        if keys in existing:
+            continue
+        start = time.perf_counter()
+        target.create_index(keys, name=name)
+        print(f"已创建索引 {name}，耗时{time.perf_counter() - start:.1f}秒")
+        created.append(name)
+    return created
+
+
+def storage_report(target=None):
+    """
+    通过 $collStats 统计存储占用，返回并打印每条文档的平均存储字节数。
+    """
+    target = as_collection(target)
+    stats = next(target.aggregate([{"$collStats": {"storageStats": {}}}]))["storageStats"]
+    # 时间序列集合的 count 是桶的数量，文档数需要单独统计
+    documents = target.estimated_document_count() if "timeseries" in stats else stats.get("count", 0)
+    report = {
+        "documents": documents,
+        "size": stats.get("size", 0),
+        "storage_size": stats.get("storageSize", 0),
+        "index_size": stats.get("totalIndexSize", 0),
+        "buckets": stats.get("timeseries", {}).get("bucketCount"),
+    }
+    report["storage_bytes_per_document"] = report["storage_size"] / documents if documents else 0.0
+    report["index_bytes_per_document"] = report["index_size"] / documents if documents else 0.0
+    print(f"{target.database.name}.{target.name}: {documents}条文档，存储{report['storage_size'] / 1024 / 1024:.1f} MiB"
+          f"（{report['storage_bytes_per_document']:.1f}字节/条），索引{report['index_size'] / 1024 / 1024:.1f} MiB"
+          f"（{report['index_bytes_per_document']:.1f}字节/条）")
+    return report
+
+
+ROLLUP_INTERVALS = ("minute", "hour")
+
+
+def bucket_start(timestamp, interval):
+    if interval == "minute":
+        return timestamp.replace(second=0, microsecond=0)
+    if interval == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    raise ValueError(f"不支持的汇总粒度: {interval}")
+
+
+class Rollup:
+    """
+    导入时按 (粒度, mac, 桶起始时间) 汇总：文档数、第一条和最后一条 val。
+
+    只累加实际新写入的文档，所以用 "upsert"/"dedupe" 模式重复导入同一范围不会重复计数；
+    write() 把桶合并到汇总集合中已有的桶，只更新本次涉及的桶。
+    时间相同的文档按 metadata.index（再按 val）决定先后，结果与写线程完成的顺序无关。
+    """
+
+    def __init__(self, intervals=ROLLUP_INTERVALS):
+        for interval in intervals:
+            bucket_start(datetime.min, interval)
+        self.intervals = tuple(intervals)
+        self.buckets = {}  # (interval, mac, start) -> [count, first, last]，first/last 为 (timestamp, index, val)
+        self.lock = threading.Lock()
+
+    def add(self, documents):
+        with self.lock:
+            for document in documents:
+                timestamp = document["timestamp"]
+                mac = document["metadata"]["mac"]
+                order = (timestamp, document["metadata"]["index"], document["val"])
+                for interval in self.intervals:
+                    key = (interval, mac, bucket_start(timestamp, interval))
+                    bucket = self.buckets.get(key)
+                    if bucket is None:
+                        self.buckets[key] = [1, order, order]
+                        continue
+                    bucket[0] += 1
+                    if order < bucket[1]:
+                        bucket[1] = order
+                    if order > bucket[2]:
+                        bucket[2] = order
+
+    def documents(self):
+        for (interval, mac, start), (count, first, last) in sorted(self.buckets.items()):
+            yield {
+                "interval": interval,
+                "mac": mac,
+                "start": start,
+                "count": count,
+                "first": {"timestamp": first[0], "index": first[1], "val": first[2]},
+                "last": {"timestamp": last[0], "index": last[1], "val": last[2]},
+            }
+
+    def write(self, target, batch_size=1000):
+        """
+        批量合并到汇总集合：count 累加，first/last 取时间更早/更晚的一条，时间相同时比较 index（需要 MongoDB 4.2+）。
+        写入后清空已累加的桶，避免同一实例再次写入时重复累加。
+
+        :return: 写入的桶数
+        """
+        from pymongo import UpdateOne
+
+        target.create_index([("mac", 1), ("interval", 1), ("start", 1)], unique=True, name="mac_interval_start")
+        requests = []
+        for bucket in self.documents():
+            requests.append(UpdateOne(
+                {"interval": bucket["interval"], "mac": bucket["mac"], "start": bucket["start"]},
+                [{"$set": {
+                    "count": {"$add": [{"$ifNull": ["$count", 0]}, bucket["count"]]},
+                    "first": {"$cond": [_keeps_existing("$first", bucket["first"], "$lt"),
+                                        "$first", {"$literal": bucket["first"]}]},
+                    "last": {"$cond": [_keeps_existing("$last", bucket["last"], "$gt"),
+                                       "$last", {"$literal": bucket["last"]}]},
+                }}],
+                upsert=True))
+            if len(requests) >= batch_size:
+                target.bulk_write(requests, ordered=False)
+                requests = []
+        if requests:
+            target.bulk_write(requests, ordered=False)
+        with self.lock:
+            count = len(self.buckets)
+            self.buckets = {}
+        return count
+
+
+def _keeps_existing(field, new, compare):
+    # 已有的 first/last 比新值更早/更晚，或时间相同且 index 不大于/不小于新值时保留已有的
+    return {"$and": [
+        {"$ne": [{"$type": field}, "missing"]},
+        {"$or": [
+            {compare: [f"{field}.timestamp", new["timestamp"]]},
+            {"$and": [{"$eq": [f"{field}.timestamp", new["timestamp"]]},
+                      {"$or": [{"$eq": [f"{field}.index", new["index"]]},
+                               {compare: [f"{field}.index", new["index"]]}]}]},
+        ]},
+    ]}
+
+
+def rollup_collection(target=None):
+    # 汇总集合与原始数据集合在同一数据库，名称加 _rollup 后缀
+    collection = as_collection(target)
+    return collection.database[f"{collection.name}_rollup"]
+
+
+def write_rollup(rollup, target=None, rollup_target=None):
+    """
+    把导入时累加的汇总写入汇总集合；目标不是MongoDB且未指定 rollup_target 时不写入。
+    """
+    if rollup_target is None:
+        if target is not None and not is_mongo(target):
+            print(f"汇总了{len(rollup.buckets)}个时间桶（写入目标不是MongoDB，未写入汇总集合）")
+            return 0
+        rollup_target = rollup_collection(target)
+    start = time.perf_counter()
+    count = rollup.write(rollup_target)
+    print(f"已写入{count}个汇总时间桶到 {rollup_target.name}，耗时{time.perf_counter() - start:.1f}秒")
+    return count
+
+
+def _write_partial_rollup(rollup, target=None, rollup_target=None):
+    """
+    导入中途出错时仍写入已提交批次的汇总：这些文档已在库中，重新运行或断点续传时会被跳过，
+    不在此时写入汇总就会永久少计。写汇总本身出错时只打印，保留原来的异常。
+    """
+    if rollup is None or not rollup.buckets:
+        return
+    try:
+        write_rollup(rollup, target, rollup_target)
+    except Exception as e:
+        print(f"写入已提交批次的汇总时出错: {e}")
+
+
+class Checkpoint:
+    """
+    断点记录：{"file", "params", "offset", "rows"}，offset 为已全部提交的行之后的字节偏移。
+
+    批次由多个写线程乱序完成，只有当之前提交的批次都已完成时才向前推进，
+    所以重启后从 offset 继续不会漏行（配合 "upsert"/"dedupe" 模式也不会重复）。
+    params 记录影响写入内容的参数（mac、day_offset 等），与本次运行不同时拒绝继续；导入成功后调用 clear() 删除。
+    """
+
+    def __init__(self, path, csv_file_path, params=None):
+        self.path = path
+        self.file = os.path.abspath(csv_file_path)
+        # 经过一次JSON转换，与从文件读回的值可以直接比较
+        self.params = json.loads(json.dumps(params or {}))
+        self.offset = 0
+        self.rows = 0
+        self.lock = threading.Lock()
+        self._submitted = 0
+        self._committed = 0
+        self._pending = {}
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path, mode='r', encoding='utf-8') as file:
+                data = json.load(file)
+            if data["file"] != self.file:
+                raise ValueError(f"检查点 {self.path} 属于文件 {data['file']}，不是 {self.file}")
+            if data.get("params") != self.params:
+                raise ValueError(f"检查点 {self.path} 的参数 {data.get('params')} 与本次运行的 {self.params} 不同，"
+                                 f"请删除检查点或使用 resume=False 重新开始")
+            self.offset, self.rows = data["offset"], data["rows"]
+        return self
+
+    def clear(self):
+        # 导入全部完成后删除，之后用同一路径重新运行时从头开始
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def track(self, offset, rows):
+        # 提交批次时调用（按文件顺序），返回该批次写入成功后的回调
+        sequence = self._submitted
+        self._submitted += 1
+        return lambda: self._commit(sequence, offset, rows)
+
+    def _commit(self, sequence, offset, rows):
+        with self.lock:
+            self._pending[sequence] = (offset, rows)
+            if self._committed not in self._pending:
+                return
+            while self._committed in self._pending:
+                offset, rows = self._pending.pop(self._committed)
+                self.offset = offset
+                self.rows += rows
+                self._committed += 1
+            self.save()
+
+    def save(self):
+        # 先写临时文件再替换，进程中途退出也不会留下损坏的检查点
+        temp_path = os.path.join(os.path.dirname(os.path.abspath(self.path)), f".{os.path.basename(self.path)}.{uuid.uuid4().hex}.tmp")
+        with open(temp_path, mode='w', encoding='utf-8') as file:
+            json.dump({"file": self.file, "params": self.params, "offset": self.offset, "rows": self.rows}, file)
+        os.replace(temp_path, self.path)
+
+
+class BatchWriter:
+    """
+    批量写入线程池：解析线程把批次放入有界队列，多个写线程并行调用 sink.write 写入。
+
+    任一写线程出错后，后续 submit/close 会重新抛出该异常。
+    """
+
+    def __init__(self, target=None, workers=4, queue_size=8, write_concern=None, mode="insert", rollup=None):
+        """
+        :param target: 写入目标，见 as_sink
+        :param write_concern: 仅对MongoDB目标有效
+        :param rollup: Rollup 实例，累加每批中新写入的文档
+        """
+        if mode not in MODES:
+            raise ValueError(f"不支持的写入模式: {mode}")
+        self.sink = as_sink(target, write_concern)
+        self.mode = mode
+        self.rollup = rollup
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.error = None
+        self.documents = 0
+        self.inserted = 0
+        self.batches = 0
+        self.threads = [threading.Thread(target=self._run, name=f"BatchWriter-{i}", daemon=True) for i in range(workers)]
+        self.started = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(raise_error=exc_type is None)
+
+    def start(self):
+        self.started = time.perf_counter()
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                batch, callback = item
+                if self.error is None:
+                    inserted = self.sink.write(batch, self.mode)
+                    if self.rollup is not None:
+                        self.rollup.add(inserted)
+                    with self.lock:
+                        self.documents += len(batch)
+                        self.inserted += len(inserted)
+                        self.batches += 1
+                    if callback is not None:
+                        callback()
+            except BaseException as e:
+                with self.lock:
+                    if self.error is None:
+                        self.error = e
+            finally:
+                self.queue.task_done()
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise self.error
+
+    def submit(self, batch, callback=None):
+        """
+        :param callback: 该批次写入成功后在写线程中调用
+        """
+        # 队列已满时阻塞，限制内存中待写入的批次数量
+        self._raise_error()
+        while True:
+            try:
+                self.queue.put((batch, callback), timeout=1)
+                return
+            except queue.Full:
+                self._raise_error()
+
+    def close(self, raise_error=True):
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        if raise_error:
+            self._raise_error()
+        return self.stats()
+
+    def stats(self):
+        seconds = time.perf_counter() - self.started if self.started else 0.0
+        return {
+            "documents": self.documents,
+            "inserted": self.inserted,
+            "skipped": self.documents - self.inserted,
+            "batches": self.batches,
+            "seconds": seconds,
+            "docs_per_sec": self.documents / seconds if seconds else 0.0,
+        }
+
+
+def bulk_insert_csv(csv_file_path, mac=None, day_offset=0, batch_size=1000, workers=4, queue_size=8,
+                    write_concern=None, target=None, parser="csv", mode="insert", checkpoint_path=None, resume=True,
+                    provision=False, granularity="seconds", defer_indexes=False, rollup=None, rollup_target=None):
+    """
+    流水线方式导入CSV：当前线程解析，写线程并行执行无序批量写入。
+
+    :param workers: 写线程数
+    :param queue_size: 等待写入的最大批次数
+    :param write_concern: 写关注，例如 1、"majority" 或 {"w": 1, "j": False}
+    :param target: 写入目标（见 as_sink），默认为 DataV.vehicle_data
+    :param parser: "csv" 或 "pandas"
+    :param mode: "insert"、"upsert" 或 "dedupe"（见 write_documents），后两者可安全地重复运行
+    :param checkpoint_path: 检查点文件，每个批次提交后更新，导入成功后删除；None 表示不记录
+    :param resume: 检查点存在时从记录的位置继续（mac/day_offset/parser/mode 须与上次相同）
+    :param provision: 导入前创建/校验时间序列集合及索引（见 ensure_collection），导入后报告存储占用
+    :param granularity: 时间序列集合的粒度
+    :param defer_indexes: 导入完成后再建二级索引，适合超大批量导入
+    :param rollup: 汇总粒度，如 ("minute", "hour")，或 Rollup 实例；导入结束后写入汇总集合
+    :param rollup_target: 汇总集合，默认为目标集合名加 _rollup
+    :return: 统计信息 {"documents", "inserted", "skipped", "batches", "seconds", "docs_per_sec"}
+    """
+    target = default_sink() if target is None else target
+    check_dedupe_target(target, mode, provision)
+    if provision:
+        ensure_collection(target, granularity, create_indexes=not defer_indexes)
+    ensure_key_index(target, mode)
+    checkpoint = None
+    start_offset = 0
+    if checkpoint_path:
+        checkpoint = Checkpoint(checkpoint_path, csv_file_path,
+                                {"mac": mac, "day_offset": day_offset, "parser": parser, "mode": mode})
+        if resume:
+            checkpoint.load()
+            start_offset = checkpoint.offset
+            if checkpoint.rows:
+                print(f"从检查点继续：已提交{checkpoint.rows}行，字节偏移{checkpoint.offset}")
+
+    if rollup is not None and not isinstance(rollup, Rollup):
+        rollup = Rollup(rollup)
+    try:
+        with BatchWriter(target, workers, queue_size, write_concern, mode=mode, rollup=rollup) as writer:
+            for batch, offset in iter_document_batches(csv_file_path, mac, day_offset, batch_size, parser,
+                                                       start_offset):
+                writer.submit(batch, checkpoint.track(offset, len(batch)) if checkpoint else None)
+    except BaseException:
+        _write_partial_rollup(rollup, target, rollup_target)
+        raise
+    if checkpoint:
+        checkpoint.clear()
+    stats = writer.stats()
+    print(f"已处理{stats['documents']}条文档（新写入{stats['inserted']}条，跳过重复{stats['skipped']}条），"
+          f"共{stats['batches']}批，耗时{stats['seconds']:.1f}秒，{stats['docs_per_sec']:.0f}条/秒")
+    if rollup is not None:
+        stats["rollup_buckets"] = write_rollup(rollup, target, rollup_target)
+    if provision:
+        if defer_indexes:
+            ensure_indexes(target)
+        storage_report(target)
+    return stats
+
+
+def process_csv_and_update_db(csv_file_path, mac=None, day_offset=0, batch_size=1000, workers=4, write_concern=None,
+                              parser="csv", mode="insert", checkpoint_path=None, provision=False, defer_indexes=False,
+                              rollup=None):
     """
     读取CSV文件，修改指定数据，并插入到MongoDB。
 
     :param csv_file_path: CSV文件路径
     :param day_offset: 偏移的天数，整数（正为增加天数，负为减少天数）
+    :param mode: 重复运行或断点续传时使用 "upsert"/"dedupe" 避免重复数据
+    :param checkpoint_path: 检查点文件，存在时从上次中断的位置继续
+    :param provision: 导入前创建/校验时间序列集合和索引，defer_indexes=True 时导入后再建索引
+    :param rollup: 同时生成按分钟/小时的汇总，如 ("minute", "hour")
     """
     try:
-        documents = []
-        with open(csv_file_path, mode='r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                # 获取并修改数据
-                created_time = datetime.strptime(row['created'], "%Y-%m-%d %H:%M:%S")
-                new_created_time = created_time + timedelta(days=day_offset)
-
-                value_parts = row['value'].split(',')
-                if len(value_parts) == 4:
-                    value_parts[0] = new_created_time.strftime("%Y%m%d%H%M%S")
-                    value_parts[3] = new_created_time.strftime("%Y%m%d%H%M%S")
-
-                new_value = ','.join(value_parts)
-
-                # 构造要插入的文档
-                document = {
-                    "timestamp": new_created_time,
-                    "metadata": {
-                        "index": int(row['index']),
-                        "mac": mac if mac else row['mac']
-                    },
-                    "val": new_value
-                }
-                documents.append(document)
-
-                # 批量插入
-                if len(documents) >= batch_size:
-                    collection.insert_many(documents)
-                    print(f"已插入{len(documents)}条文档")
-                    documents = []
-
-            # 插入剩余文档
-            if documents:
-                collection.insert_many(documents)
-                print(f"已插入{len(documents)}条文档")
+        return bulk_insert_csv(csv_file_path, mac, day_offset, batch_size, workers, write_concern=write_concern,
+                               parser=parser, mode=mode, checkpoint_path=checkpoint_path, provision=provision,
+                               defer_indexes=defer_indexes, rollup=rollup)
     except Exception as e:
         print(f"处理CSV文件时出错: {e}")
+        raise
+
+
+def find_csv_files(source):
+    # source 为目录（取其中所有 .csv）或通配符，如 "data/*/2024-09-*.csv"
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, "*.csv")))
+    return sorted(glob.glob(source, recursive=True))
+
+
+def load_manifest(manifest_path):
+    """
+    读取清单，为每个文件指定 mac 和 day_offset。
+
+    JSON：{"文件名": {"mac": "...", "day_offset": 69}, ...}
+    CSV：表头为 file,mac,day_offset
+    文件名可以是文件名本身或完整路径，返回 {文件名: {"mac", "day_offset"}}。
+    """
+    with open(manifest_path, mode='r', encoding='utf-8') as file:
+        if manifest_path.lower().endswith(".json"):
+            entries = json.load(file)
+        else:
+            entries = {row["file"]: row for row in csv.DictReader(file)}
+    manifest = {}
+    for name, entry in entries.items():
+        day_offset = entry.get("day_offset")
+        manifest[os.path.basename(name)] = {
+            "mac": entry.get("mac") or None,
+            "day_offset": int(day_offset) if day_offset not in (None, "") else None,
+        }
+    return manifest
+
+
+# 解析进程中的全局变量，由 _init_parse_worker 设置
+_batch_queue = None
+_stop_event = None
+
+
+def _init_parse_worker(batch_queue, stop_event):
+    global _batch_queue, _stop_event
+    _batch_queue = batch_queue
+    _stop_event = stop_event
+
+
+def _put_batch(item):
+    # 主进程出错后设置 stop_event，解析进程不再阻塞在已满的队列上
+    while not _stop_event.is_set():
+        try:
+            _batch_queue.put(item, timeout=1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _parse_file(csv_file_path, mac, day_offset, batch_size, parser):
+    # 在解析进程中运行：把批次发送给主进程的写线程池，最后发送 (文件, None, (行数, 解析秒数)) 作为结束标记
+    start = time.perf_counter()
+    rows = 0
+    for batch, _ in iter_document_batches(csv_file_path, mac, day_offset, batch_size, parser):
+        if not _put_batch((csv_file_path, batch, None)):
+            return
+        rows += len(batch)
+    _put_batch((csv_file_path, None, (rows, time.perf_counter() - start)))
+
+
+def ingest_files(source, manifest=None, mac=None, day_offset=0, batch_size=1000, parse_workers=None, workers=4,
+                 queue_size=16, write_concern=None, target=None, parser="csv", mode="insert", rollup=None,
+                 rollup_target=None):
+    """
+    导入目录或通配符匹配的多个CSV：多个进程并行解析，批次汇总到主进程共用的写线程池。
+
+    :param source: 目录或通配符
+    :param manifest: 清单文件路径（见 load_manifest），未列出的文件使用 mac/day_offset 参数
+    :param parse_workers: 解析进程数，默认为CPU核数
+    :param workers: 写线程数
+    :param rollup: 汇总粒度或 Rollup 实例，见 bulk_insert_csv
+    :return: {"files": [每个文件的统计], 以及与 bulk_insert_csv 相同的汇总统计}
+    """
+    files = find_csv_files(source)
+    if not files:
+        raise FileNotFoundError(f"没有找到CSV文件: {source}")
+    entries = load_manifest(manifest) if manifest else {}
+    target = default_sink() if target is None else target
+    check_dedupe_target(target, mode)
+    ensure_key_index(target, mode)
+
+    # 每个文件的统计：批次写入成功后在写线程中累加
+    file_stats = {path: {"file": path, "rows": 0, "written": 0, "parse_seconds": None,
+                         "started": None, "finished": None} for path in files}
+    lock = threading.Lock()
+
+    def on_written(path, count):
+        def callback():
+            with lock:
+                stats = file_stats[path]
+                stats["written"] += count
+                if stats["parse_seconds"] is not None and stats["written"] == stats["rows"]:
+                    stats["finished"] = time.perf_counter()
+        return callback
+
+    # 写线程（以及 dedupe/upsert 模式下的 MongoClient）已在运行时 fork 可能死锁，解析进程一律用 spawn 启动
+    context = multiprocessing.get_context("spawn")
+    batch_queue = context.Queue(maxsize=queue_size)
+    stop_event = context.Event()
+    if rollup is not None and not isinstance(rollup, Rollup):
+        rollup = Rollup(rollup)
+    try:
+        with BatchWriter(target, workers, queue_size, write_concern, mode=mode, rollup=rollup) as writer, \
+                ProcessPoolExecutor(parse_workers, mp_context=context, initializer=_init_parse_worker,
+                                    initargs=(batch_queue, stop_event)) as executor:
+            futures = []
+            for path in files:
+                entry = entries.get(os.path.basename(path), {})
+                file_mac = entry.get("mac") or mac
+                file_day_offset = day_offset if entry.get("day_offset") is None else entry["day_offset"]
+                futures.append(executor.submit(_parse_file, path, file_mac, file_day_offset, batch_size, parser))
+            try:
+                remaining = len(files)
+                while remaining:
+                    try:
+                        path, batch, parsed = batch_queue.get(timeout=1)
+                    except queue.Empty:
+                        for future in futures:
+                            if future.done() and future.exception() is not None:
+                                raise future.exception()
+                        continue
+                    if batch is None:
+                        remaining -= 1
+                        with lock:
+                            stats = file_stats[path]
+                            stats["rows"], stats["parse_seconds"] = parsed
+                            if stats["written"] == stats["rows"]:
+                                stats["finished"] = time.perf_counter()
+                        continue
+                    with lock:
+                        if file_stats[path]["started"] is None:
+                            file_stats[path]["started"] = time.perf_counter()
+                    writer.submit(batch, on_written(path, len(batch)))
+            except BaseException:
+                stop_event.set()
+                raise
+    except BaseException:
+        _write_partial_rollup(rollup, target, rollup_target)
+        raise
+
+    aggregate = writer.stats()
+    results = []
+    for path in files:
+        stats = file_stats[path]
+        seconds = (stats["finished"] - stats["started"]) if stats["started"] and stats["finished"] else 0.0
+        results.append({"file": path, "rows": stats["rows"], "parse_seconds": stats["parse_seconds"],
+                        "seconds": seconds, "docs_per_sec": stats["rows"] / seconds if seconds else 0.0})
+        print(f"{os.path.basename(path)}: {stats['rows']}行，解析{stats['parse_seconds']:.1f}秒，"
+              f"写入完成{seconds:.1f}秒，{results[-1]['docs_per_sec']:.0f}条/秒")
+    print(f"共{len(files)}个文件，{aggregate['documents']}条文档（新写入{aggregate['inserted']}条），"
+          f"耗时{aggregate['seconds']:.1f}秒，{aggregate['docs_per_sec']:.0f}条/秒")
+    if rollup is not None:
+        aggregate["rollup_buckets"] = write_rollup(rollup, target, rollup_target)
+    return {"files": results, **aggregate}
+
+
+def make_macs(count, base="876543210000"):
+    # 从 base 开始连续生成 count 个12位十六进制MAC
+    start = int(base, 16)
+    return [f"{start + i:012X}" for i in range(count)]
+
+
+def shift_document(document, mac, delta):
+    # 复制文档到另一辆虚拟车辆并整体平移时间，value 中的时间戳同步更新
+    timestamp = document["timestamp"] + delta
+    value_parts = document["val"].split(',')
+    if len(value_parts) == 4:
+        value_parts[0] = value_parts[3] = timestamp.strftime("%Y%m%d%H%M%S")
+    return {
+        "timestamp": timestamp,
+        "metadata": {"index": document["metadata"]["index"], "mac": mac},
+        "val": ','.join(value_parts)
+    }
+
+
+def _vehicle_stream(source, mac, delta):
+    # 每辆车一个生成器，mac/delta 作为参数绑定（生成器表达式会在循环结束后才读取循环变量）
+    for document in source:
+        yield shift_document(document, mac, delta)
+
+
+class RateLimiter:
+    """
+    限制每秒写入的文档数（令牌桶，按批次申请），rate 为 None 时不限速。
+    """
+
+    def __init__(self, rate=None):
+        self.rate = rate
+        self.next_time = time.perf_counter()
+
+    def acquire(self, count):
+        if not self.rate:
+            return
+        now = time.perf_counter()
+        if self.next_time > now:
+            time.sleep(self.next_time - now)
+        self.next_time = max(self.next_time, now) + count / self.rate
+
+
+def load_fleet(csv_file_path, vehicles=100, day_offset=0, jitter_seconds=0, speed=None, rate=None, batch_size=1000,
+               workers=4, queue_size=8, write_concern=None, target=None, parser="csv", mode="insert",
+               mac_base="876543210000", seed=None, report_interval=10):
+    """
+    压测用：把一个CSV复制成多辆虚拟车辆写入MongoDB。
+
+    每辆车使用 make_macs 生成的MAC，时间在 day_offset 基础上再随机平移 0~jitter_seconds 秒。
+
+    :param speed: None 尽快批量写入；1 按原始时间间隔实时回放，60 表示60倍速回放
+    :param rate: 最大写入速度（条/秒），None 表示不限速
+    :param report_interval: 每隔多少秒打印一次实际吞吐量
+    :return: 写入统计信息，另含 "vehicles" 和 "target_rate"
+    """
+    target = default_sink() if target is None else target
+    ensure_key_index(target, mode)
+    macs = make_macs(vehicles, mac_base)
+    generator = random.Random(seed)
+    deltas = [timedelta(seconds=generator.randint(0, jitter_seconds)) for _ in macs]
+    limiter = RateLimiter(rate)
+    sent = 0
+    last_report = [time.perf_counter(), 0]
+
+    def submit(writer, batch):
+        nonlocal sent
+        limiter.acquire(len(batch))
+        writer.submit(batch)
+        sent += len(batch)
+        now = time.perf_counter()
+        if now - last_report[0] >= report_interval:
+            print(f"已发送{sent}条文档，当前{(sent - last_report[1]) / (now - last_report[0]):.0f}条/秒")
+            last_report[:] = [now, sent]
+
+    with BatchWriter(target, workers, queue_size, write_concern, mode=mode) as writer:
+        if speed is None:
+            # 源文件只解析一次，每个源批次依次复制给所有车辆
+            for source, _ in iter_document_batches(csv_file_path, None, day_offset, batch_size, parser):
+                for mac, delta in zip(macs, deltas):
+                    submit(writer, [shift_document(document, mac, delta) for document in source])
+        else:
+            # 回放需要按时间合并所有车辆的数据，源文件读入内存并按时间排序
+            source = [document for batch, _ in iter_document_batches(csv_file_path, None, day_offset, batch_size, parser)
+                      for document in batch]
+            source.sort(key=lambda document: document["timestamp"])
+            streams = [_vehicle_stream(source, mac, delta) for mac, delta in zip(macs, deltas)]
+            start = time.perf_counter()
+            first = None
+            batch = []
+            for document in heapq.merge(*streams, key=lambda document: document["timestamp"]):
+                if first is None:
+                    first = document["timestamp"]
+                due = start + (document["timestamp"] - first).total_seconds() / speed
+                if due > time.perf_counter():
+                    # 先把已到期的数据写出去，再等待下一条
+                    if batch:
+                        submit(writer, batch)
+                        batch = []
+                    time.sleep(max(0.0, due - time.perf_counter()))
+                batch.append(document)
+                if len(batch) >= batch_size:
+                    submit(writer, batch)
+                    batch = []
+            if batch:
+                submit(writer, batch)
+
+    stats = writer.stats()
+    stats.update({"vehicles": vehicles, "target_rate": rate})
+    print(f"{vehicles}辆虚拟车辆共写入{stats['documents']}条文档，耗时{stats['seconds']:.1f}秒，"
+          f"实际{stats['docs_per_sec']:.0f}条/秒" + (f"（目标{rate}条/秒）" if rate else ""))
+    return stats
 
 
 if __name__ == '__main__':
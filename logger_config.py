@@ -1,8 +1,25 @@
+import atexit
+import collections
 import logging
+import queue
+import threading
 import tkinter as tk
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
+# logger名 -> QueueListener，启用队列模式后由监听线程把日志分发给实际的处理器
+_listeners = {}
+_listeners_lock = threading.Lock()
 
-def get_logger(logger_name=__name__):
+
+def get_logger(logger_name=__name__, queued=False, queue_size=10000, drop_when_full=True, log_file=None,
+               console_level=logging.DEBUG, file_level=logging.DEBUG, max_bytes=10 * 1024 * 1024, backup_count=5):
+    """
+    :param queued: True时调用线程只把日志放入队列，由一个监听线程写控制台/文件/Tk窗口，
+                   已用普通模式创建的logger会被转换为队列模式
+    :param queue_size: 队列容量
+    :param drop_when_full: 队列满时丢弃 WARNING 以下的日志并计数（见 get_logging_stats），False 时一律等待
+    :param log_file: 同时写入按大小轮转的日志文件
+    """
     # 创建日志记录器
     logger = logging.getLogger(logger_name)
 
@@ -13,7 +30,7 @@ def get_logger(logger_name=__name__):
 
         # 创建控制台处理器
         console_handler = ColorHandler()
-        console_handler.setLevel(logging.DEBUG)
+        console_handler.setLevel(console_level)
 
         # 创建日志格式器
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s: %(message)s')
@@ -24,21 +41,164 @@ def get_logger(logger_name=__name__):
         # 将控制台处理器添加到日志记录器
         logger.addHandler(console_handler)
 
+    if log_file and not any(getattr(handler, "baseFilename", None) == log_file for handler in get_handlers(logger)):
+        file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        file_handler.setLevel(file_level)
+        file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s: %(message)s'))
+        attach_handler(logger, file_handler)
+
+    if queued:
+        _enable_queue(logger, queue_size, drop_when_full)
+
     return logger
 
 
+def _enable_queue(logger, queue_size, drop_when_full):
+    with _listeners_lock:
+        if logger.name in _listeners:
+            return
+        handlers = logger.handlers[:]
+        log_queue = queue.Queue(maxsize=queue_size)
+        # 各处理器按自己的级别过滤
+        queue_handler = DroppingQueueHandler(log_queue, drop_when_full)
+        listener = BlockingSentinelListener(log_queue, *handlers, respect_handler_level=True,
+                                            queue_handler=queue_handler)
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(queue_handler)
+        listener.start()
+        atexit.register(listener.stop)
+        _listeners[logger.name] = listener
+
+
+def get_handlers(logger):
+    # 实际输出日志的处理器（队列模式下为监听线程中的处理器）
+    listener = _listeners.get(logger.name)
+    return list(listener.handlers) if listener else logger.handlers[:]
+
+
+def attach_handler(logger, handler):
+    """
+    添加处理器：队列模式下加到监听线程，否则直接加到logger。
+    """
+    with _listeners_lock:
+        listener = _listeners.get(logger.name)
+        if listener is None:
+            logger.addHandler(handler)
+        elif handler not in listener.handlers:
+            listener.handlers = listener.handlers + (handler,)
+
+
+def get_logging_stats(logger):
+    """
+    :return: {"queued": 是否为队列模式, "pending": 队列中待处理条数, "dropped": 丢弃总数, "dropped_by_level": {级别名: 条数}}
+    """
+    for handler in logger.handlers:
+        if isinstance(handler, DroppingQueueHandler):
+            return {"queued": True, "pending": handler.queue.qsize(), "dropped": handler.dropped,
+                    "dropped_by_level": dict(handler.dropped_by_level)}
+    return {"queued": False, "pending": 0, "dropped": 0, "dropped_by_level": {}}
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    队列满时不阻塞调用线程而是丢弃日志并计数，队列恢复后（或监听线程停止时）补发一条警告说明丢弃了多少条。
+
+    WARNING 及以上和带异常信息的日志从不丢弃，队列满时等待。
+    """
+
+    def __init__(self, log_queue, drop_when_full=True):
+        super().__init__(log_queue)
+        self.drop_when_full = drop_when_full
+        self.lock_counter = threading.Lock()
+        self.dropped = 0
+        self.dropped_by_level = collections.Counter()
+        self._unreported = 0
+        self._dropped_name = None
+
+    def enqueue(self, record):
+        block = not self.drop_when_full or record.levelno >= logging.WARNING or bool(record.exc_info)
+        try:
+            if self._unreported:
+                self._report_dropped(record.name, block)
+            self.queue.put(record, block)
+        except queue.Full:
+            with self.lock_counter:
+                self.dropped += 1
+                self._unreported += 1
+                self.dropped_by_level[record.levelname] += 1
+                self._dropped_name = record.name
+
+    def report_dropped(self):
+        # 监听线程停止前调用，补报尚未报告的丢弃条数
+        if self._unreported:
+            self._report_dropped(self._dropped_name, True)
+
+    def _report_dropped(self, name, block=False):
+        with self.lock_counter:
+            count, self._unreported = self._unreported, 0
+        try:
+            self.queue.put(logging.makeLogRecord({
+                "name": name, "levelno": logging.WARNING, "levelname": "WARNING",
+                "msg": f"日志队列已满，丢弃了{count}条日志（累计{self.dropped}条）"}), block)
+        except queue.Full:
+            with self.lock_counter:
+                self._unreported += count
+            raise
+
+
+class BlockingSentinelListener(QueueListener):
+    def __init__(self, log_queue, *handlers, respect_handler_level=False, queue_handler=None):
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.queue_handler = queue_handler
+
+    def stop(self):
+        # atexit 也会调用，已停止时跳过；停止前补报丢弃条数，保证退出时也能看到
+        if self._thread is None:
+            return
+        if self.queue_handler is not None:
+            self.queue_handler.report_dropped()
+        super().stop()
+
+    # 默认的 enqueue_sentinel 使用 put_nowait，队列满时程序退出会出错
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
 class TextHandler(logging.Handler):
-    def __init__(self, widget):
+    def __init__(self, widget, poll_interval=None):
+        """
+        :param poll_interval: 毫秒；设置后 emit 只缓存日志，由Tk主循环定时批量写入控件，
+                              可在其他线程（如队列监听线程）中安全使用。须在Tk线程中创建
+        """
         super().__init__()
         self.widget = widget
+        self.poll_interval = poll_interval
+        self.pending = collections.deque()
+        if poll_interval:
+            self.widget.after(poll_interval, self._flush)
 
     def emit(self, record):
         msg = self.format(record)
+        if self.poll_interval:
+            self.pending.append(msg)
+            return
+        self._write([msg])
+
+    def _write(self, messages):
         self.widget.configure(state='normal')
-        self.widget.insert(tk.END, msg + '\n')
+        self.widget.insert(tk.END, '\n'.join(messages) + '\n')
         self.widget.configure(state='disabled')
         self.widget.yview(tk.END)
 
+    def _flush(self):
+        messages = []
+        while self.pending:
+            messages.append(self.pending.popleft())
+        if messages:
+            self._write(messages)
+        self.widget.after(self.poll_interval, self._flush)
+
 
 class ColorHandler(logging.StreamHandler):
     # https://en.wikipedia.org/wiki/ANSI_escape_code#Colors
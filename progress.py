@@ -0,0 +1,102 @@
+import collections
+import threading
+import time
+
+
+class ProgressTracker:
+    """
+    线程安全的进度计数：工作线程每完成一行调用 done()，界面或无界面运行器定时读取 snapshot()。
+
+    一次运行可以分多个阶段（如先检查错误码再检查故障码规则），每个阶段有自己的总数和速度/剩余时间。
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stage = ""
+        self.total = 0
+        self.completed = 0
+        self.counts = collections.Counter()  # 本次运行所有阶段的结果计数
+        self.started = None
+        self.stage_started = None
+        self.finished = False
+
+    def start_stage(self, stage, total):
+        with self.lock:
+            now = time.perf_counter()
+            if self.started is None:
+                self.started = now
+            self.stage = stage
+            self.total = total
+            self.completed = 0
+            self.stage_started = now
+            self.finished = False
+
+    def done(self, result):
+        # result 为 "Pass"、"Failed"、"Error"、"Ignore" 等
+        with self.lock:
+            self.completed += 1
+            self.counts[result] += 1
+
+    def finish(self):
+        with self.lock:
+            self.finished = True
+
+    def snapshot(self):
+        with self.lock:
+            now = time.perf_counter()
+            elapsed = now - self.stage_started if self.stage_started else 0.0
+            rate = self.completed / elapsed if elapsed > 0 else 0.0
+            remaining = self.total - self.completed
+            return {
+                "stage": self.stage,
+                "completed": self.completed,
+                "total": self.total,
+                "percent": self.completed / self.total * 100 if self.total else 0.0,
+                "rows_per_sec": rate,
+                "eta_seconds": remaining / rate if rate > 0 and remaining > 0 else None,
+                "elapsed_seconds": now - self.started if self.started else 0.0,
+                "counts": dict(self.counts),
+                "finished": self.finished,
+            }
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+
+def format_status(snapshot):
+    counts = snapshot["counts"]
+    return (f"{snapshot['stage']} {snapshot['completed']}/{snapshot['total']} ({snapshot['percent']:.1f}%) "
+            f"{snapshot['rows_per_sec']:.1f} rows/s | Pass {counts.get('Pass', 0)} Failed {counts.get('Failed', 0)} "
+            f"Error {counts.get('Error', 0)} | ETA {format_duration(snapshot['eta_seconds'])}")
+
+
+class StatusReporter:
+    """
+    无界面运行时定时输出进度，例如 with StatusReporter(tracker, 10, logger.info): ...
+    """
+
+    def __init__(self, tracker, interval=10, output=print):
+        self.tracker = tracker
+        self.interval = interval
+        self.output = output
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="StatusReporter", daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop_event.set()
+        self.thread.join()
+        self.output(format_status(self.tracker.snapshot()))
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            self.output(format_status(self.tracker.snapshot()))
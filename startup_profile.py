@@ -0,0 +1,133 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# 工具名 -> (所在目录, 模块名, 是否有 MyApp 窗口)
+TOOLS = {
+    "error_service_checker": (ROOT, "error_service_checker", True),
+    "R3_registrar": (os.path.join(ROOT, "R3"), "registrar", True),
+    "insert_dataV_data": (ROOT, "insert_dataV_data", False),
+}
+
+# 在子进程中运行：导入模块、创建窗口并完成第一次绘制后输出时间戳
+WINDOW_SCRIPT = """
+import time, json
+start = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+window = None
+try:
+    app = {module}.MyApp()
+    app.update()
+    window = time.time()
+    app.destroy()
+except Exception as e:
+    print("window error:", e)
+print(json.dumps({{"import_seconds": imported - start, "window_time": window}}))
+"""
+
+HEAVY_MODULES = ("pandas", "openpyxl", "numpy", "jsonpath_ng", "pymongo", "requests")
+
+
+def _environment(directory):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([directory, ROOT, env.get("PYTHONPATH", "")])
+    return env
+
+
+def import_breakdown(directory, module, top=15):
+    """
+    用 python -X importtime 统计导入模块时各个包的耗时。
+
+    :return: {"total_seconds", "top": [(包名, 累计秒数), ...], "heavy": {重型模块: 是否在启动时被导入}}
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=directory,
+                            env=_environment(directory), capture_output=True, text=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        entries.append((name.rstrip(), int(cumulative) / 1e6))
+    # 顶层导入（没有缩进）的累计时间之和即为总导入时间
+    total = sum(seconds for name, seconds in entries if not name.startswith("  "))
+    imported = {name.strip() for name, _ in entries}
+    ranked = sorted(((name.strip(), seconds) for name, seconds in entries), key=lambda item: item[1], reverse=True)
+    return {
+        "total_seconds": total,
+        "top": ranked[:top],
+        "heavy": {name: name in imported for name in HEAVY_MODULES},
+    }
+
+
+def time_to_window(directory, module):
+    """
+    从启动解释器到窗口第一次绘制完成的时间（秒），无法创建窗口（如没有显示器）时为 None。
+    """
+    launched = time.time()
+    result = subprocess.run([sys.executable, "-c", WINDOW_SCRIPT.format(module=module)], cwd=directory,
+                            env=_environment(directory), capture_output=True, text=True)
+    lines = [line for line in result.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        raise RuntimeError(f"{module} 启动失败:\n{result.stderr}")
+    data = json.loads(lines[-1])
+    window = data["window_time"] - launched if data["window_time"] else None
+    return data["import_seconds"], window
+
+
+def profile_tools(tools=None, repeat=3, top=15):
+    results = []
+    for name in tools or TOOLS:
+        directory, module, has_window = TOOLS[name]
+        breakdown = import_breakdown(directory, module, top)
+        import_times, window_times = [], []
+        for _ in range(repeat):
+            if has_window:
+                import_seconds, window_seconds = time_to_window(directory, module)
+                import_times.append(import_seconds)
+                if window_seconds is not None:
+                    window_times.append(window_seconds)
+            else:
+                import_times.append(import_breakdown(directory, module, top)["total_seconds"])
+        result = {
+            "tool": name,
+            "import_seconds": statistics.median(import_times),
+            "time_to_window_seconds": statistics.median(window_times) if window_times else None,
+            "importtime_total_seconds": breakdown["total_seconds"],
+            "heavy_modules_at_startup": [module for module, loaded in breakdown["heavy"].items() if loaded],
+            "top_imports": breakdown["top"],
+        }
+        results.append(result)
+
+        window = f"{result['time_to_window_seconds']:.3f} s" if result["time_to_window_seconds"] is not None else "n/a"
+        print(f"{name}: import {result['import_seconds']:.3f} s, first window {window}, "
+              f"heavy modules at startup: {', '.join(result['heavy_modules_at_startup']) or 'none'}")
+        for package, seconds in result["top_imports"]:
+            print(f"    {seconds * 1000:9.1f} ms  {package}")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="测量各工具的启动时间和导入耗时分布")
+    parser.add_argument("--tools", nargs="+", choices=list(TOOLS), help="默认测量全部工具")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数，取中位数")
+    parser.add_argument("--top", type=int, default=15, help="列出耗时最多的导入数")
+    parser.add_argument("--output", help="结果JSON文件")
+    args = parser.parse_args()
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": profile_tools(args.tools, args.repeat, args.top),
+    }
+    if args.output:
+        with open(args.output, mode='w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
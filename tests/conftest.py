@@ -0,0 +1,8 @@
+import os
+import sys
+
+# 脚本之间用同级导入（如 from map_io import ...），测试时把仓库根目录和 R3 加入搜索路径
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "R3")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,11 @@
+from benchmark import run_benchmarks
+from map_io import load_json
+
+
+def test_run_benchmarks_smoke(tmp_path):
+    output_path = str(tmp_path / "benchmark_result.json")
+    report = run_benchmarks([(1, 10)], output_path, work_dir=str(tmp_path))
+    cases = {result["case"] for result in report["results"]}
+    assert cases == {"generate_point_list", "modify_json", "offset_points_in_template",
+                     "replace_points_in_template", "copy_zones"}
+    assert load_json(output_path) == report
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from geometry import circle_points, polygons_overlap, simplify_points
+
+
+def max_deviation(points, simplified, closed):
+    # 原始各点到简化后折线/多边形的最大距离
+    points = np.asarray(points, dtype=np.float64)
+    simplified = np.asarray(simplified, dtype=np.float64)
+    start = simplified if closed else simplified[:-1]
+    end = np.roll(simplified, -1, axis=0) if closed else simplified[1:]
+    direction = end - start
+    offset = points[:, None] - start[None]
+    length_squared = np.maximum(np.sum(direction ** 2, axis=1), 1e-300)
+    t = np.clip(np.sum(offset * direction[None], axis=2) / length_squared, 0, 1)
+    distances = np.hypot(*np.moveaxis(offset - t[..., None] * direction[None], 2, 0))
+    return distances.min(axis=1).max()
+
+
+def test_simplify_keeps_path_that_doubles_back():
+    simplified = simplify_points([(0, 0), (10, 0), (2, 0)], 0.01, closed=False)
+    assert simplified.tolist() == [[0, 0], [10, 0], [2, 0]]
+
+
+@pytest.mark.parametrize("tolerance", [0.01, 0.5, 3.0])
+def test_simplify_open_path_within_tolerance(tolerance):
+    generator = np.random.default_rng(0)
+    # 随机游走，包含大量折返
+    points = np.cumsum(generator.normal(size=(500, 2)), axis=0)
+    simplified = simplify_points(points, tolerance, closed=False)
+    assert max_deviation(points, simplified, closed=False) <= tolerance
+
+
+@pytest.mark.parametrize("tolerance", [0.01, 0.5, 3.0])
+def test_simplify_closed_polygon_within_tolerance(tolerance):
+    generator = np.random.default_rng(1)
+    points = circle_points(0, 0, 10000, 400) + generator.normal(scale=0.5, size=(400, 2))
+    simplified = simplify_points(points, tolerance, closed=True)
+    assert len(simplified) >= 3
+    assert max_deviation(points, simplified, closed=True) <= tolerance
+
+
+def square(x0, y0, x1, y1):
+    return np.array([(x0, y0), (x1, y0), (x1, y1), (x0, y1)], dtype=np.float64)
+
+
+@pytest.mark.parametrize("n_points", [5, 6, 50, 173])
+def test_identical_polygons_overlap(n_points):
+    polygon = circle_points(12.5, -3.0, 400, n_points)
+    assert polygons_overlap(polygon, polygon.copy())
+    # 同一个区域，点序从另一个顶点开始
+    assert polygons_overlap(polygon, np.roll(polygon, 2, axis=0))
+
+
+@pytest.mark.parametrize("polygon_a, polygon_b, expected", [
+    # 共用一条边的相邻区域
+    (square(0, 0, 2, 2), square(2, 0, 4, 2), False),
+    # 共用半条边
+    (square(0, 0, 2, 2), square(2, 1, 4, 3), False),
+    # 只在一个顶点接触
+    (square(0, 0, 2, 2), square(2, 2, 4, 4), False),
+    # 分离
+    (square(0, 0, 2, 2), square(3, 0, 5, 2), False),
+    # 嵌套且共用一个顶点
+    (square(0, 0, 4, 4), square(0, 0, 1, 1), True),
+    # 嵌套且共用一条边的一部分
+    (square(0, 0, 4, 4), square(1, 0, 2, 1), True),
+    # 完全嵌套、不接触
+    (square(0, 0, 4, 4), square(1, 1, 2, 2), True),
+    # 部分重叠，边共线，没有真正相交的边
+    (square(0, 0, 2, 2), square(1, 0, 3, 2), True),
+    # 普通的边相交
+    (square(0, 0, 2, 2), square(1, 1, 3, 3), True),
+])
+def test_polygons_overlap_touching_cases(polygon_a, polygon_b, expected):
+    assert polygons_overlap(polygon_a, polygon_b) is expected
+    assert polygons_overlap(polygon_b, polygon_a) is expected
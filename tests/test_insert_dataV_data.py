@@ -0,0 +1,182 @@
+import os
+from collections import Counter
+from datetime import datetime
+from unittest.mock import MagicMock
+import pytest
+from dataV_benchmark import generate_csv
+from insert_dataV_data import (MemorySink, Rollup, bulk_insert_csv, ingest_files, iter_documents_csv,
+                               iter_documents_pandas, load_fleet)
+
+
+def test_load_fleet_replay_writes_every_vehicle(tmp_path):
+    csv_path = str(tmp_path / "vehicle.csv")
+    generate_csv(csv_path, 200)
+    sink = MemorySink()
+    stats = load_fleet(csv_path, vehicles=3, jitter_seconds=5, speed=1e9, batch_size=50, target=sink, seed=1)
+    macs = Counter(document["metadata"]["mac"] for document in sink.documents)
+    assert len(macs) == 3
+    assert set(macs.values()) == {200}
+    assert stats["documents"] == 600
+
+
+def test_load_fleet_bulk_writes_every_vehicle(tmp_path):
+    csv_path = str(tmp_path / "vehicle.csv")
+    generate_csv(csv_path, 200)
+    sink = MemorySink()
+    load_fleet(csv_path, vehicles=3, batch_size=50, target=sink)
+    assert Counter(document["metadata"]["mac"] for document in sink.documents) == {
+        "876543210000": 200, "876543210001": 200, "876543210002": 200}
+
+
+class FailingSink(MemorySink):
+    # 写入 fail_after 批后出错，模拟导入中途失败
+    def __init__(self, fail_after):
+        super().__init__()
+        self.fail_after = fail_after
+        self.batches = 0
+
+    def write(self, documents, mode="insert"):
+        with self.lock:
+            self.batches += 1
+            if self.batches > self.fail_after:
+                raise ConnectionError("write failed")
+        return super().write(documents, mode)
+
+
+class RecordingCollection:
+    # 记录 bulk_write 请求的汇总集合
+    name = "vehicle_data_rollup"
+
+    def __init__(self):
+        self.requests = []
+
+    def create_index(self, *args, **kwargs):
+        pass
+
+    def bulk_write(self, requests, ordered=True):
+        self.requests.extend(requests)
+
+
+def test_rollup_written_for_committed_batches_on_failure(tmp_path):
+    csv_path = str(tmp_path / "vehicle.csv")
+    generate_csv(csv_path, 500)
+    sink = FailingSink(fail_after=3)
+    rollup_target = RecordingCollection()
+    with pytest.raises(ConnectionError):
+        bulk_insert_csv(csv_path, batch_size=50, workers=1, target=sink, rollup=("minute",),
+                        rollup_target=rollup_target)
+    counted = sum(request._doc[0]["$set"]["count"]["$add"][1] for request in rollup_target.requests)
+    assert counted == len(sink.documents) == 150
+
+
+def test_rollup_first_last_independent_of_order():
+    start = datetime(2024, 9, 22)
+    documents = [{"timestamp": start, "metadata": {"index": index, "mac": "A"}, "val": str(index)}
+                 for index in (3, 1, 2)]
+    results = []
+    for ordered in (documents, documents[::-1]):
+        rollup = Rollup(("minute",))
+        for document in ordered:
+            rollup.add([document])
+        results.append(list(rollup.documents()))
+    assert results[0] == results[1]
+    assert results[0][0]["first"]["index"] == 1
+    assert results[0][0]["last"]["index"] == 3
+
+
+def test_ingest_files_parses_in_spawned_processes(tmp_path):
+    for name in ("a.csv", "b.csv"):
+        generate_csv(str(tmp_path / name), 300)
+    sink = MemorySink()
+    stats = ingest_files(str(tmp_path), mac="AABBCCDDEEFF", batch_size=100, parse_workers=2, target=sink,
+                         mode="upsert")
+    assert stats["documents"] == 600
+    assert [file_stats["rows"] for file_stats in stats["files"]] == [300, 300]
+
+
+def test_checkpoint_rejects_different_parameters(tmp_path):
+    csv_path = str(tmp_path / "vehicle.csv")
+    checkpoint_path = str(tmp_path / "vehicle.checkpoint")
+    generate_csv(csv_path, 500)
+    with pytest.raises(ConnectionError):
+        bulk_insert_csv(csv_path, mac="AABBCCDDEEFF", batch_size=50, workers=1, target=FailingSink(fail_after=3),
+                        mode="upsert", checkpoint_path=checkpoint_path)
+    with pytest.raises(ValueError):
+        bulk_insert_csv(csv_path, mac="112233445566", batch_size=50, workers=1, target=MemorySink(),
+                        mode="upsert", checkpoint_path=checkpoint_path)
+
+    sink = MemorySink()
+    stats = bulk_insert_csv(csv_path, mac="AABBCCDDEEFF", batch_size=50, workers=1, target=sink, mode="upsert",
+                            checkpoint_path=checkpoint_path)
+    assert stats["documents"] == 350
+    assert not os.path.exists(checkpoint_path)
+
+
+def test_dedupe_rejects_timeseries_collection():
+    from pymongo.collection import Collection
+
+    collection = MagicMock(spec=Collection)
+    collection.name = "vehicle_data"
+    collection.database.list_collections.return_value = iter(
+        [{"name": "vehicle_data", "options": {"timeseries": {"timeField": "timestamp"}}}])
+    with pytest.raises(ValueError, match="upsert"):
+        bulk_insert_csv("unused.csv", target=collection, mode="dedupe")
+    collection.create_index.assert_not_called()
+
+
+@pytest.mark.parametrize("timeseries", [False, True])
+def test_upsert_creates_key_index_before_loading(tmp_path, timeseries):
+    from pymongo.collection import Collection
+
+    collection = MagicMock(spec=Collection)
+    collection.name = "vehicle_data"
+    options = {"timeseries": {"timeField": "timestamp"}} if timeseries else {}
+    collection.database.list_collections.return_value = iter([{"name": "vehicle_data", "options": options}])
+    collection.index_information.return_value = {"_id_": {"key": [("_id", 1)]}}
+    with pytest.raises(FileNotFoundError):
+        bulk_insert_csv(str(tmp_path / "missing.csv"), target=collection, mode="upsert", defer_indexes=True)
+    keys, = collection.create_index.call_args.args
+    assert keys == [("metadata.mac", 1), ("metadata.index", 1), ("timestamp", 1)]
+    assert collection.create_index.call_args.kwargs.get("unique", False) is not timeseries
+
+
+# CRLF 与 LF 混用、空行、非4段的 value（见 make_document）
+EDGE_CASE_CSV = (
+    b"index,mac,created,value\r\n"
+    b'1,AABBCCDDEEFF,2024-09-22 08:00:00,"20240922080000,1,2,20240922080000"\r\n'
+    b"\r\n"
+    b'2,AABBCCDDEEFF,2024-09-22 08:00:01,"a,b,c"\n'
+    b"\n"
+    b'3,AABBCCDDEEFF,2024-09-22 08:00:02,"a,b,c,d,e"\r\n'
+    b"4,AABBCCDDEEFF,2024-09-22 08:00:03,single\n"
+    b"5,AABBCCDDEEFF,2024-09-22 08:00:04,\r\n"
+    b'6,001122334455,2024-09-22 08:00:05,"x,,,y"\r\n'
+    b"\r\n"
+)
+
+
+def assert_parsers_match(path, mac=None, day_offset=0, start_offset=0):
+    expected = list(iter_documents_csv(path, mac, day_offset, start_offset))
+    assert list(iter_documents_pandas(path, mac, day_offset, start_offset, chunk_size=3)) == expected
+    assert list(iter_documents_pandas(path, mac, day_offset, start_offset)) == expected
+    return expected
+
+
+def test_pandas_parser_matches_csv_parser_on_generated_csv(tmp_path):
+    csv_path = str(tmp_path / "vehicle.csv")
+    generate_csv(csv_path, 500, vehicles=3)
+    assert len(assert_parsers_match(csv_path)) == 500
+    assert len(assert_parsers_match(csv_path, mac="AABBCCDDEEFF", day_offset=7)) == 500
+
+
+def test_pandas_parser_matches_csv_parser_on_edge_cases(tmp_path):
+    csv_path = tmp_path / "edge.csv"
+    csv_path.write_bytes(EDGE_CASE_CSV)
+    expected = assert_parsers_match(str(csv_path), day_offset=1)
+    assert [document["val"] for document, _ in expected] == [
+        "20240923080000,1,2,20240923080000", "a,b,c", "a,b,c,d,e", "single", "", "20240923080005,,,20240923080005"]
+    # 最后一条记录结束于末尾空行之前
+    assert expected[-1][1] == len(EDGE_CASE_CSV) - len(b"\r\n")
+    # 从每条记录结束处的偏移（检查点）继续，两种解析器结果仍然一致
+    for index, (_, offset) in enumerate(expected):
+        assert assert_parsers_match(str(csv_path), day_offset=1, start_offset=offset) == expected[index + 1:]
@@ -0,0 +1,50 @@
+import copy
+import pytest
+from json_path import get_path, set_path, set_paths
+
+
+def test_copy_mode_leaves_input_untouched():
+    doc = {"a": {"b": 1, "c": [1, 2]}, "d": {"e": 3}}
+    original = copy.deepcopy(doc)
+    result = set_paths(doc, [("$.a.b", 2), ("$.a.c[1]", 5)], copy=True)
+    assert doc == original
+    assert result == {"a": {"b": 2, "c": [1, 5]}, "d": {"e": 3}}
+    # 未修改的分支与原数据共享
+    assert result["d"] is doc["d"]
+
+
+def test_copy_mode_does_not_mutate_replacement_value():
+    doc = {"a": {"b": 1}}
+    value = {"b": 2, "c": 3}
+    result = set_paths(doc, [("$.a", value), ("$.a.b", 99)], copy=True)
+    assert result == {"a": {"b": 99, "c": 3}}
+    assert value == {"b": 2, "c": 3}
+    assert doc == {"a": {"b": 1}}
+
+
+def test_in_place_mode_modifies_input():
+    doc = {"a": {"b": 1}}
+    assert set_path(doc, "$.a.b", 2) is doc
+    assert doc == {"a": {"b": 2}}
+
+
+def test_child_path_before_its_prefix_is_rejected():
+    doc = {"a": {"b": 1}}
+    with pytest.raises(ValueError, match=r"\$\.a\.b"):
+        set_paths(doc, [("$.a.b", 1), ("$.a", {"b": 2})], copy=True)
+    assert doc == {"a": {"b": 1}}
+
+
+def test_repeated_path_keeps_last_value():
+    assert set_paths({"a": 1}, [("$.a", 2), ("$.a", 3)], copy=True) == {"a": 3}
+
+
+def test_root_path_replaces_document():
+    assert set_path({"a": 1}, "$", [1, 2], copy=True) == [1, 2]
+
+
+def test_missing_path_raises():
+    with pytest.raises(ValueError):
+        set_path({"a": {}}, "$.a.b", 1, copy=True)
+    with pytest.raises(ValueError):
+        get_path({"a": [1]}, "$.a[3]")
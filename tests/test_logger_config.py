@@ -0,0 +1,73 @@
+import logging
+import queue
+import sys
+import threading
+from logger_config import BlockingSentinelListener, DroppingQueueHandler
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_record(level, msg="x", exc_info=None):
+    return logging.LogRecord("test", level, __file__, 1, msg, None, exc_info)
+
+
+def test_full_queue_drops_only_records_below_warning():
+    log_queue = queue.Queue(maxsize=1)
+    handler = DroppingQueueHandler(log_queue)
+    handler.handle(make_record(logging.INFO, "first"))
+    handler.handle(make_record(logging.DEBUG))
+    assert handler.dropped_by_level == {"DEBUG": 1}
+
+    # 队列满时 ERROR 等待而不是丢弃
+    thread = threading.Thread(target=handler.handle, args=(make_record(logging.ERROR, "error"),))
+    thread.start()
+    thread.join(0.2)
+    assert thread.is_alive()
+    messages = [log_queue.get(timeout=1).getMessage()]
+    while thread.is_alive() or not log_queue.empty():
+        messages.append(log_queue.get(timeout=1).getMessage())
+    thread.join()
+    assert messages[0] == "first"
+    assert messages[-1] == "error"
+    assert handler.dropped == 1
+
+
+def test_exception_records_are_not_dropped():
+    log_queue = queue.Queue(maxsize=1)
+    handler = DroppingQueueHandler(log_queue)
+    handler.handle(make_record(logging.INFO))
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        record = make_record(logging.DEBUG, "traceback", sys.exc_info())
+    thread = threading.Thread(target=handler.handle, args=(record,))
+    thread.start()
+    log_queue.get(timeout=1)
+    thread.join(1)
+    assert not thread.is_alive()
+    assert handler.dropped == 0
+    # QueueHandler 会把异常信息格式化进消息
+    assert log_queue.get_nowait().getMessage().startswith("traceback\nTraceback")
+
+
+def test_listener_stop_reports_unreported_drops():
+    log_queue = queue.Queue(maxsize=2)
+    handler = DroppingQueueHandler(log_queue)
+    for _ in range(5):
+        handler.handle(make_record(logging.DEBUG))
+    assert handler.dropped == 3
+
+    output = ListHandler()
+    listener = BlockingSentinelListener(log_queue, output, queue_handler=handler)
+    listener.start()
+    listener.stop()
+    listener.stop()
+    assert [record.levelno for record in output.records] == [logging.DEBUG, logging.DEBUG, logging.WARNING]
+    assert "丢弃了3条" in output.records[-1].getMessage()
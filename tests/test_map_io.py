@@ -0,0 +1,20 @@
+import json
+import pytest
+import map_io
+from map_io import dumps
+
+
+@pytest.mark.parametrize("data", [
+    [float("nan")],
+    {"x": float("inf"), "y": -float("inf"), "z": None},
+    {"points": [{"x": 1.5, "y": float("nan")}]},
+])
+@pytest.mark.parametrize("backend", map_io.available_backends())
+def test_non_finite_floats_match_stdlib(data, backend):
+    assert dumps(data, backend) == json.dumps(data, indent=None, separators=(",", ":")).encode("ascii")
+
+
+@pytest.mark.parametrize("data", [["\x7f"], {"name\x7f": "a\x00b\x1f\x7f\u00e9"}])
+@pytest.mark.parametrize("backend", map_io.available_backends())
+def test_control_characters_match_stdlib(data, backend):
+    assert dumps(data, backend) == json.dumps(data, indent=None, separators=(",", ":")).encode("ascii")
@@ -0,0 +1,39 @@
+import os
+import shutil
+import numpy as np
+import pytest
+from map_folder import MapFolder
+from map_io import load_json
+from point_store import CompactObject, compact_folder, publish_folder
+
+TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "R3", "map", "template")
+
+
+def test_compact_and_publish_round_trip(tmp_path):
+    source = tmp_path / "source"
+    shutil.copytree(TEMPLATE, source)
+    compact = MapFolder(str(tmp_path / "compact"), create=True)
+    names = compact_folder(str(source), compact)
+    compact.save()
+    published = tmp_path / "published"
+    published.mkdir()
+    assert publish_folder(compact, str(published)) == names
+    for name in names:
+        assert load_json(str(published / f"{name}.object")) == load_json(str(source / f"{name}.object"))
+    assert not [filename for filename in os.listdir(compact.path) if filename.startswith(".")]
+
+
+def test_failed_save_keeps_previous_points(tmp_path, monkeypatch):
+    folder = str(tmp_path)
+    CompactObject({"header": {"name": "A"}}, "$.area.points", np.zeros((3, 2))).save(folder, "A")
+
+    def broken_save(file, array):
+        file.write(b"truncated")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(np, "save", broken_save)
+    with pytest.raises(OSError):
+        CompactObject({"header": {"name": "A"}}, "$.area.points", np.ones((5, 2))).save(folder, "A")
+    monkeypatch.undo()
+    assert CompactObject.load(folder, "A", mmap=False).points.shape == (3, 2)
+    assert sorted(os.listdir(folder)) == ["A.points.json", "A.points.npy"]
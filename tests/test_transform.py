@@ -0,0 +1,41 @@
+import math
+import os
+import pytest
+from map_io import load_json
+from transform import mirror, rotation, transform_object
+
+TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "R3", "map", "template")
+
+
+def load_template(name):
+    return load_json(os.path.join(TEMPLATE, f"{name}.object"))
+
+
+def approach_heading(transport_path):
+    # 运输路径最后一段的方位角：0°指向+y，顺时针为正
+    (x0, y0), (x1, y1) = [(point["x"], point["y"]) for point in transport_path["transport_path"]["points"][-2:]]
+    return math.degrees(math.atan2(x1 - x0, y1 - y0)) % 360
+
+
+def angle_difference(a, b):
+    return abs((a - b + 180) % 360 - 180)
+
+
+def test_rotating_waypoint_90_degrees_turns_heading():
+    station = load_template("CS001")
+    rotated = transform_object(station, rotation(90))
+    # 逆时针旋转90°，方位角（顺时针为正）减少90°
+    assert rotated["waypoint"]["entry_direction"] == pytest.approx(
+        (station["waypoint"]["entry_direction"] - 90) % 360)
+    location = station["waypoint"]["location"]
+    assert rotated["waypoint"]["location"]["x"] == pytest.approx(-location["y"])
+    assert rotated["waypoint"]["location"]["y"] == pytest.approx(location["x"])
+
+
+@pytest.mark.parametrize("matrix", [rotation(0), rotation(90), rotation(-135, pivot=(3, 4)), mirror("x"),
+                                    mirror("y", pivot=(1, 1))])
+def test_heading_follows_transport_path_into_station(matrix):
+    # TP001 驶入 CS001，变换后 entry_direction 应仍与最后一段路径方向一致
+    station = transform_object(load_template("CS001"), matrix)
+    path = transform_object(load_template("TP001"), matrix)
+    assert angle_difference(station["waypoint"]["entry_direction"], approach_heading(path)) < 5